@@ -0,0 +1,79 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE_FOLDERS = ('general', 'dsp-module', 'process-communication', 'regulation')
+
+# Modules that importing a package alone must not load
+HEAVY_MODULES = ('numpy', 'socket', 'multiprocessing')
+
+# (statement, whether it may load heavy modules)
+CASES = (
+    ('import decorators', False),
+    ('import dsp', False),
+    ('import proccom', False),
+    ('import regutil', False),
+    ('import regutil.util', False),
+    ('from decorators import profiled, memoize', False),
+    ('from proccom import Publisher', True),
+    ('from dsp.core import Filter', True),
+    ('from dsp.util import butterworth', True),
+    ('import regutil.simulation', True),
+)
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))
+'''
+
+
+def measure(statement: str, repeat: int):
+    """
+    Imports in fresh interpreters, so every run pays the full import cost
+
+    :param statement: the import statement
+    :param repeat: number of interpreters
+    :return: median import time in seconds, heavy modules loaded by the statement
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.join(ROOT, folder) for folder in MODULE_FOLDERS] + [env.get('PYTHONPATH', '')])
+    times = []
+    loaded = ''
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+                                env=env, capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ''
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time benchmark for the rntools packages')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per case')
+    parser.add_argument('--max-ms', type=float, default=50.0,
+                        help='budget for imports that must not load heavy modules')
+    args = parser.parse_args()
+    failures = []
+    print(f'{"statement":<44} {"time [ms]":>10}  heavy modules loaded')
+    for statement, heavy_allowed in CASES:
+        seconds, loaded = measure(statement, args.repeat)
+        status = ''
+        if not heavy_allowed and (loaded or seconds * 1e3 > args.max_ms):
+            status = '  FAIL'
+            failures.append(statement)
+        print(f'{statement:<44} {seconds * 1e3:>10.2f}  {loaded or "-"}{status}')
+    if failures:
+        print(f'\n{len(failures)} import(s) loaded heavy modules or exceeded {args.max_ms:g} ms')
+        sys.exit(1)
+    print(f'\nall lightweight imports within {args.max_ms:g} ms')
+
+
+if __name__ == '__main__':
+    main()
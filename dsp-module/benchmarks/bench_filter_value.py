@@ -0,0 +1,38 @@
+import random
+import time
+from dsp.core.filter import Filter
+from benchmarks.reference import ReferenceFilter, coefficients
+
+
+def per_sample_cost(flt, samples: list, repeat: int = 3):
+    """
+    Measures the average time of a single filter_value call, best of several runs
+
+    :param flt: the filter to measure
+    :param samples: the input samples
+    :param repeat: number of runs
+    :return: time per sample in microseconds
+    """
+    filter_value = flt.filter_value
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for x in samples:
+            filter_value(x)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(samples) / 1000
+
+
+def main(orders=(2, 4, 8, 16, 32, 64), n=20000):
+    samples = [random.uniform(-1, 1) for _ in range(n)]
+    print(f'{"order":>6} {"ring buffer [us]":>18} {"reference [us]":>16} {"speedup":>8}')
+    for order in orders:
+        b, a = coefficients(order)
+        ring = per_sample_cost(Filter(b, a), samples)
+        reference = per_sample_cost(ReferenceFilter(b, a), samples)
+        print(f'{order:>6} {ring:>18.3f} {reference:>16.3f} {reference / ring:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+from dsp.core.filter import Filter, MultiChannelFilter
+from dsp.util.analysis import get_frequency_response, _frequency_response
+from dsp.util.design import butterworth, chebyshev1
+from dsp.util.helper_functions import generate_signal
+from benchmarks.reference import ReferenceFilter, coefficients, reference_frequency_response, \
+    reference_generate_signal
+
+# Maximum allowed deviation from the reference implementation, relative to the largest reference value
+TOLERANCE = 1e-9
+
+
+def measure(func, *args, repeat: int = 3):
+    """
+    Measures the best run time of several runs and the peak memory allocated during a run
+
+    :param func: the function to measure
+    :param args: arguments for the function
+    :param repeat: number of runs
+    :return: result of the last run, best time in seconds, peak memory in bytes
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def relative_error(result, reference):
+    """
+    Largest absolute deviation between result and reference, relative to the largest reference magnitude
+
+    :param result: the measured output
+    :param reference: the reference output
+    :return: the relative error
+    """
+    result = np.asarray(result, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if result.shape != reference.shape:
+        return np.inf
+    scale = max(np.abs(reference).max(initial=0), 1e-300)
+    return np.abs(result - reference).max(initial=0) / scale
+
+
+class Suite:
+    """
+    Collects benchmark rows, accuracy failures and block paths that are slower than their per-sample counterpart
+    """
+
+    def __init__(self):
+        self.failures = []
+        self.slow = []
+        print(f'{"case":<34} {"params":<40} {"samples/s":>12} {"peak memory":>12} {"rel. error":>11}')
+
+    def report(self, case: str, params: str, samples: int, seconds: float, peak: int, error: float):
+        status = '' if error <= TOLERANCE else '  FAIL'
+        if status:
+            self.failures.append((case, params, error))
+        print(f'{case:<34} {params:<40} {samples / seconds:>12.3e} {peak / 1024:>9.1f} KiB {error:>11.2e}{status}')
+
+    def report_speedup(self, case: str, params: str, seconds: float, baseline_seconds: float):
+        speedup = baseline_seconds / seconds
+        status = '' if speedup >= 1 else '  FAIL'
+        if status:
+            self.slow.append((case, params, speedup))
+        print(f'{case:<34} {params:<40} {"speedup":>12} {speedup:>12.2f}x{status}')
+
+
+def design_cases(quick: bool):
+    """
+    Real IIR designs at low cutoffs. Their high order direct forms are ill conditioned, so these cases catch block
+    implementations that lose accuracy or diverge.
+
+    :param quick: use a reduced set of designs
+    :return: list of (label, b, a)
+    """
+    designs = [('butter', 4, 0.002), ('butter', 8, 0.02), ('cheby1', 6, 0.01), ('butter', 10, 0.05)]
+    if not quick:
+        designs += [('butter', 6, 0.02), ('cheby1', 8, 0.02), ('cheby1', 10, 0.05)]
+    cases = []
+    for kind, order, cutoff in designs:
+        b, a = butterworth(order, cutoff) if kind == 'butter' else chebyshev1(order, 1, cutoff)
+        cases.append((f'{kind} order={order} fc={cutoff:g}', b, a))
+    return cases
+
+
+def bench_filter_value(suite: Suite, orders, n):
+    samples = [random.uniform(-1, 1) for _ in range(n)]
+    for order in orders:
+        b, a = coefficients(order)
+
+        def run(flt):
+            return [flt.filter_value(x) for x in samples]
+
+        result, seconds, peak = measure(lambda: run(Filter(b, a)))
+        reference = ReferenceFilter(b, a).filter_list(samples)
+        suite.report('Filter.filter_value', f'order={order} n={n}', n, seconds, peak,
+                     relative_error(result, reference))
+
+
+def bench_filter_list(suite: Suite, orders, lengths, designs):
+    cases = [(f'order={order}',) + coefficients(order) for order in orders] + designs
+    for n in lengths:
+        samples = [random.uniform(-1, 1) for _ in range(n)]
+        for label, b, a in cases:
+            result, seconds, peak = measure(lambda: Filter(b, a).filter_list(samples))
+            reference = ReferenceFilter(b, a).filter_list(samples)
+            suite.report('Filter.filter_list', f'{label} n={n}', n, seconds, peak,
+                         relative_error(result, reference))
+
+
+def bench_multichannel(suite: Suite, order, channel_counts, n):
+    b, a = coefficients(order)
+    for channels in channel_counts:
+        samples = np.random.uniform(-1, 1, (n, channels))
+        rows = samples.tolist()
+
+        def run():
+            flt = MultiChannelFilter(channels, b, a)
+            return [flt.filter_values(row) for row in rows]
+
+        result, seconds, peak = measure(run)
+        references = [ReferenceFilter(b, a) for _ in range(channels)]
+        reference = [[references[c].filter_value(x) for c, x in enumerate(row)] for row in rows]
+        suite.report('MultiChannelFilter.filter_values', f'order={order} ch={channels} n={n}', n * channels,
+                     seconds, peak, relative_error(result, reference))
+
+
+def bench_multichannel_block(suite: Suite, designs, channel_counts, n):
+    for label, b, a in designs:
+        for channels in channel_counts:
+            samples = np.random.uniform(-1, 1, (n, channels))
+            result, seconds, peak = measure(lambda: MultiChannelFilter(channels, b, a).filter_block(samples))
+            reference = np.column_stack([ReferenceFilter(b, a).filter_list(samples[:, c].tolist())
+                                         for c in range(channels)])
+            suite.report('MultiChannelFilter.filter_block', f'{label} ch={channels} n={n}', n * channels,
+                         seconds, peak, relative_error(result, reference))
+
+
+def bench_block_speedup(suite: Suite, designs, channel_counts, n):
+    for label, b, a in designs:
+        for channels in channel_counts:
+            samples = np.random.uniform(-1, 1, (n, channels))
+            rows = samples.tolist()
+
+            def run_rows():
+                flt = MultiChannelFilter(channels, b, a)
+                return [flt.filter_values(row) for row in rows]
+
+            _, block_seconds, _ = measure(lambda: MultiChannelFilter(channels, b, a).filter_block(samples), repeat=2)
+            _, row_seconds, _ = measure(run_rows, repeat=2)
+            suite.report_speedup('filter_block vs filter_values', f'{label} ch={channels} n={n}', block_seconds,
+                                 row_seconds)
+
+
+def bench_frequency_response(suite: Suite, taps, steps):
+    for n_taps in taps:
+        b = [random.uniform(-1, 1) for _ in range(n_taps)]
+        a = [1, -0.5, 0.25]
+        result, seconds, peak = measure(lambda: _uncached_frequency_response(b, a, steps), repeat=1)
+        reference = reference_frequency_response(b, a, steps=steps)
+        phase_error = np.abs(np.angle(np.exp(1j * np.subtract(result[1], reference[1])))).max() / np.pi
+        error = max(relative_error(result[0], reference[0]), phase_error)
+        suite.report('get_frequency_response', f'taps={n_taps} steps={steps}', steps, seconds, peak, error)
+
+
+def _uncached_frequency_response(b, a, steps):
+    _frequency_response.cache_clear()
+    return get_frequency_response(b, a, steps=steps)
+
+
+def bench_generate_signal(suite: Suite, lengths):
+    for n in lengths:
+        result, seconds, peak = measure(generate_signal, 50, n, 1, 0.5, 1, repeat=1)
+        reference = reference_generate_signal(50, n, 1, 0.5, 1)
+        error = max(relative_error(r, ref) for r, ref in zip(result, reference))
+        suite.report('generate_signal', f'n={n}', n, seconds, peak, error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark and accuracy regression suite for the dsp package')
+    parser.add_argument('--quick', action='store_true', help='run a reduced set of cases')
+    quick = parser.parse_args().quick
+    random.seed(0)
+    np.random.seed(0)
+    orders = (2, 8) if quick else (2, 4, 8, 16, 32)
+    lengths = (1000,) if quick else (1000, 100000)
+    designs = design_cases(quick)
+    suite = Suite()
+    bench_filter_value(suite, orders, 2000 if quick else 20000)
+    bench_filter_list(suite, orders, lengths, designs)
+    bench_multichannel(suite, 4, (1, 8) if quick else (1, 8, 64), 500 if quick else 5000)
+    bench_multichannel_block(suite, designs, (1, 8) if quick else (1, 8, 64), 5000 if quick else 20000)
+    bench_block_speedup(suite, designs[:2], (8, 64), 2000 if quick else 10000)
+    bench_frequency_response(suite, (8, 40), 1001 if quick else 20000)
+    bench_generate_signal(suite, (10000,) if quick else (10000, 1000000))
+    if suite.failures:
+        print(f'\n{len(suite.failures)} case(s) outside tolerance {TOLERANCE:g}')
+    if suite.slow:
+        print(f'\n{len(suite.slow)} block case(s) slower than filtering row by row')
+    if suite.failures or suite.slow:
+        sys.exit(1)
+    print(f'\nall cases within tolerance {TOLERANCE:g}, block paths faster than row by row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+from math import cos, sin, atan2, pi
+
+
+class ReferenceFilter:
+    """
+    Plain list based implementation of the filter difference equation, kept as a reference for benchmarks
+    """
+
+    def __init__(self, b: list, a: list = None):
+        """
+        Creates a reference filter object
+
+        :param b: numerator coefficients of the transfer function (coeffs of X)
+        :param a: denominator coefficients of the transfer function (coeffs of Y)
+        """
+        if not a:
+            a = [1]
+        self.b = list(b)
+        self.a = list(a)
+        self.input = [0] * len(b)
+        self.output = [0] * (len(a) - 1)
+
+    def filter_value(self, x_new: float):
+        """
+        Passes a single value through the filter
+
+        :param x_new: the value to be passed through the filter
+        :return: the filter's output value
+        """
+        self.input = self._shift_list(self.input, x_new)
+        a0 = self.a.pop(0)
+        y_new = a0 * (
+                sum([b * x for b, x in zip(self.b, self.input)])
+                - sum([a * y for a, y in zip(self.a, self.output)])
+        )
+        self.a.insert(0, a0)
+        self.output = self._shift_list(self.output, y_new)
+        return y_new
+
+    def filter_list(self, xn: list):
+        """
+        Passes a list of values through the filter
+
+        :param xn: the input vector
+        :return: the filter output vector
+        """
+        return [self.filter_value(x) for x in xn]
+
+    def _shift_list(self, lst: list, val: float):
+        if len(lst) > 0:
+            lst.pop()
+            lst.insert(0, val)
+        return lst
+
+
+def coefficients(order: int):
+    """
+    Creates stable test coefficients for a filter of the given order
+
+    :param order: the filter order
+    :return: b, a
+    """
+    b = [1 / (order + 1)] * (order + 1)
+    a = [1] + [0.5 / order * (-1) ** i for i in range(1, order + 1)]
+    return b, a
+
+
+def reference_frequency_response(b, a: list = None, k: float = 1, steps: int = 1001):
+    """
+    Per-frequency evaluation of the frequency response with plain trig sums
+
+    :param b: numerator coefficients of the transfer function (coeffs of X)
+    :param a: denominator coefficients of the transfer function (coeffs of Y)
+    :param k: output gain (default 1)
+    :param steps: frequency resolution
+    :return: magnitude, phase, normalized frequency
+    """
+    if not a:
+        a = [1]
+    A = len(a)
+    B = len(b)
+    W = [i / steps for i in range(steps)]
+    magnitude = []
+    phase = []
+    for w in W:
+        w *= pi
+        ar = sum([ha * cos((1 - A + na) * w) for ha, na in zip(a, range(A))])
+        br = sum([hb * cos((1 - B + nb) * w) for hb, nb in zip(b, range(B))])
+        aj = sum([ha * sin((1 - A + na) * w) for ha, na in zip(a, range(A))])
+        bj = sum([hb * sin((1 - B + nb) * w) for hb, nb in zip(b, range(B))])
+        H = complex(br, bj) / complex(ar, aj)
+        magnitude.append(k * abs(H))
+        phase.append(-atan2(H.imag, H.real))
+    return magnitude, phase, W
+
+
+def reference_generate_signal(f, fs, A, DC, t_final, t_steps=1000):
+    """
+    Per-sample generation of a sine signal
+
+    :param f: the signal's frequency
+    :param fs: the sampling frequency
+    :param A: the sine wave amplitude
+    :param DC: an added dc component of the signal
+    :param t_final: final time for signal.
+    :param t_steps: number of steps for time vector
+    :return: x(n), t(n), x(t), t
+    """
+    w = 2 * pi * f / fs
+    T = [t_final * i / t_steps for i in range(t_steps)]
+    N = int(t_final * fs)
+    tn = [i / fs for i in range(N)]
+    xn = [A * sin(w * n) + DC for n in range(N)]
+    xt = [A * sin(2 * pi * f * t) + DC for t in T]
+    return xn, tn, xt, T
@@ -1,2 +1,9 @@
-import dsp.core as core
-import dsp.util as util
+from dsp._lazy import lazy_module
+
+# core and util are imported on first access, so importing dsp alone does not load NumPy
+_MODULES = {
+    'core': 'core',
+    'util': 'util',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, modules=_MODULES)
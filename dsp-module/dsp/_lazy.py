@@ -0,0 +1,32 @@
+import importlib
+import sys
+
+
+def lazy_module(package: str, attributes: dict = None, modules: dict = None):
+    """
+    Creates the module level __getattr__ and __dir__ (PEP 562) of a package whose contents are imported on first
+    access instead of when the package is imported
+
+    :param package: the package's __name__
+    :param attributes: names imported from modules, mapped to the module relative to the package
+    :param modules: names bound to modules, mapped to the module relative to the package
+    :return: __getattr__, __dir__ and __all__ for the package
+    """
+    attributes = attributes or {}
+    modules = modules or {}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name):
+        if name in modules:
+            value = importlib.import_module(f'{package}.{modules[name]}')
+        elif name in attributes:
+            value = getattr(importlib.import_module(f'{package}.{attributes[name]}'), name)
+        else:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes) | set(modules))
+
+    return __getattr__, __dir__, list(modules) + list(attributes)
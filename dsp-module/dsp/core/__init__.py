@@ -1 +1,26 @@
-from dsp.core.filter import *
+from dsp._lazy import lazy_module
+
+# Each name is imported from its module on first access (PEP 562)
+_ATTRIBUTES = {
+    'FFTConvolver': 'convolution',
+    'optimal_fft_size': 'convolution',
+    'FFT_MIN_TAPS': 'filter',
+    'Filter': 'filter',
+    'MultiChannelFilter': 'filter',
+    'Resampler': 'multirate',
+    'Decimator': 'multirate',
+    'Interpolator': 'multirate',
+    'tf2sos': 'sos',
+    'zpk2sos': 'sos',
+    'SOSFilter': 'sos',
+    'MultiChannelSOSFilter': 'sos',
+    'chunked': 'stream',
+    'Stage': 'stream',
+    'FilterStage': 'stream',
+    'GainStage': 'stream',
+    'DecimateStage': 'stream',
+    'SinkStage': 'stream',
+    'Pipeline': 'stream',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, attributes=_ATTRIBUTES)
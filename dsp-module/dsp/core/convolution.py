@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class FFTConvolver:
+    """
+    FFT based block convolution for FIR filters (overlap-save or overlap-add).
+
+    The object follows the same block interface as the filter's direct form block kernel: the previous len(b) - 1
+    inputs are passed in as history, so streaming a signal chunk by chunk gives the same result as one long block.
+    """
+
+    def __init__(self, b: list, method: str = 'save', fft_size: int = None):
+        """
+        Creates an FFT convolution engine
+
+        :param b: the filter taps
+        :param method: 'save' for overlap-save or 'add' for overlap-add
+        :param fft_size: FFT length, chosen automatically from the number of taps if None
+        """
+        if method not in ('save', 'add'):
+            raise ValueError(f'method must be "save" or "add", got {method}')
+        self.b = np.asarray(b, dtype=float)
+        self.method = method
+        self.nb = len(self.b) - 1
+        self.na = 0
+        self.fft_size = fft_size or optimal_fft_size(len(self.b))
+        self._spectra = {}
+
+    def process(self, x, x_hist, y_hist):
+        """
+        Filters a block of samples
+
+        :param x: input array (samples x channels)
+        :param x_hist: previous inputs, newest first (len(b) - 1 x channels)
+        :param y_hist: previous outputs, unused as the filter has no feedback
+        :return: output array, updated input history, updated output history
+        """
+        n, channels = x.shape
+        if n == 0:
+            return x.copy(), x_hist, y_hist
+        padded = np.concatenate((x_hist[::-1], x))
+        fft_size = min(self.fft_size, _next_power_of_two(self.nb + n))
+        if self.method == 'save':
+            y = self._overlap_save(padded, n, fft_size)
+        else:
+            y = self._overlap_add(padded, n, fft_size)
+        return y, padded[n:][::-1].copy(), y_hist
+
+    def _spectrum(self, fft_size: int):
+        if fft_size not in self._spectra:
+            self._spectra[fft_size] = np.fft.rfft(self.b, fft_size)
+        return self._spectra[fft_size]
+
+    def _overlap_save(self, padded, n, fft_size):
+        """
+        Each segment of fft_size samples overlaps the previous one by len(b) - 1 samples. The first len(b) - 1
+        outputs of the circular convolution are corrupted by wrap around and are discarded.
+        """
+        channels = padded.shape[1]
+        step = fft_size - self.nb
+        blocks = -(-n // step)
+        segments = np.zeros((self.nb + blocks * step, channels))
+        segments[:len(padded)] = padded
+        windows = np.lib.stride_tricks.sliding_window_view(segments, fft_size, axis=0)[::step]
+        y = np.fft.irfft(np.fft.rfft(windows, axis=-1) * self._spectrum(fft_size), fft_size, axis=-1)
+        return y[..., self.nb:].transpose(0, 2, 1).reshape(-1, channels)[:n]
+
+    def _overlap_add(self, padded, n, fft_size):
+        """
+        Non overlapping input blocks are convolved separately and the tails of the block responses are added to
+        the following blocks.
+        """
+        channels = padded.shape[1]
+        step = fft_size - self.nb
+        blocks = -(-len(padded) // step)
+        segments = np.zeros((blocks * step, channels))
+        segments[:len(padded)] = padded
+        segments = segments.reshape(blocks, step, channels).transpose(0, 2, 1)
+        responses = np.fft.irfft(np.fft.rfft(segments, fft_size, axis=-1) * self._spectrum(fft_size), fft_size, axis=-1)
+        spans = -(-fft_size // step)
+        responses = np.concatenate(
+            (responses, np.zeros((blocks, channels, spans * step - fft_size))), axis=-1
+        ).reshape(blocks, channels, spans, step)
+        full = np.zeros((blocks + spans, channels, step))
+        for span in range(spans):
+            full[span:span + blocks] += responses[:, :, span]
+        full = full.transpose(0, 2, 1).reshape(-1, channels)
+        return full[self.nb:self.nb + n]
+
+
+def optimal_fft_size(taps: int):
+    """
+    Finds the power of two FFT length with the lowest cost per output sample for a filter with the given number of
+    taps, using n * log2(n) / (n - taps + 1) as cost model.
+
+    :param taps: number of filter taps
+    :return: the FFT length
+    """
+    size = _next_power_of_two(2 * taps)
+    best, best_cost = size, np.inf
+    while size <= max(64 * taps, 1024):
+        cost = size * np.log2(size) / (size - taps + 1)
+        if cost < best_cost:
+            best, best_cost = size, cost
+        size *= 2
+    return best
+
+
+def _next_power_of_two(n: int):
+    return 1 << max(0, int(n) - 1).bit_length()
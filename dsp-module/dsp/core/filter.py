@@ -1,4 +1,23 @@
+import numpy as np
+from dsp.core.convolution import FFTConvolver
+
+# FIR filters with at least this many taps are filtered block wise with FFT convolution
+FFT_MIN_TAPS = 64
+# Blocks are filtered sample by sample while samples x coefficients is below this, the block setup costs more
+BLOCK_MIN_PRODUCTS = 512
+# Feedback of blocks with at least this many channels is evaluated for all channels at once
+VECTOR_MIN_CHANNELS = 8
+
+
 class Filter:
+    """
+    Direct form filter with its input and output history kept in preallocated ring buffers.
+
+    Each history is stored twice in a buffer of double length, so the newest-first window always is a contiguous
+    index range and a new sample is stored without shifting or allocating lists.
+    """
+
+    __slots__ = ('_b', '_a', '_a0', 'k', '_x', '_y', '_xi', '_yi', '_kernel')
 
     def __init__(self, b: list, a: list = None, k: float = 1):
         """
@@ -10,28 +29,86 @@ class Filter:
         """
         if not a:
             a = [1]
+        self._b = ()
+        self._a = ()
+        self._x = []
+        self._y = []
+        self._xi = self._yi = 0
         self.b = b
         self.a = a
         self.k = k
-        self.input = [0] * len(b)
-        self.output = [0] * (len(a) - 1)
+
+    @property
+    def b(self):
+        """
+        Numerator coefficients of the transfer function (coeffs of X)
+        """
+        return list(self._b)
+
+    @b.setter
+    def b(self, b: list):
+        self._b = tuple(b)
+        if len(self._x) != 2 * len(self._b):
+            self._x = [0] * (2 * len(self._b))
+            self._xi = 0
+        self._kernel = None
+
+    @property
+    def a(self):
+        """
+        Denominator coefficients of the transfer function (coeffs of Y)
+        """
+        return [self._a0] + list(self._a)
+
+    @a.setter
+    def a(self, a: list):
+        self._a0 = a[0]
+        self._a = tuple(a[1:])
+        if len(self._y) != 2 * len(self._a):
+            self._y = [0] * (2 * len(self._a))
+            self._yi = 0
+        self._kernel = None
+
+    @property
+    def input(self):
+        """
+        The latest inputs to the filter, newest first
+        """
+        return self._x[self._xi:self._xi + len(self._b)]
+
+    @property
+    def output(self):
+        """
+        The latest outputs of the filter, newest first
+        """
+        return self._y[self._yi:self._yi + len(self._a)]
 
     def filter_value(self, x_new: float):
         """
         Passes a single value through the filter
-        TODO: Find a better way to do the calculation than to use pop and insert for self.a[0]
 
         :param x_new: the value to be passed through the filter
         :return: the filter's output value
         """
-        self.input = self._shift_list(self.input, x_new)
-        a0 = self.a.pop(0)
-        y_new = a0 * (
-                sum([b * x for b, x in zip(self.b, self.input)])
-                - sum([a * y for a, y in zip(self.a, self.output)])
-        )
-        self.a.insert(0, a0)
-        self.output = self._shift_list(self.output, y_new)
+        x, y = self._x, self._y
+        nx, ny = len(self._b), len(self._a)
+        if nx:
+            i = self._xi = (self._xi - 1) % nx
+            x[i] = x[i + nx] = x_new
+        acc_x = 0
+        i = self._xi
+        for c in self._b:
+            acc_x += c * x[i]
+            i += 1
+        acc_y = 0
+        i = self._yi
+        for c in self._a:
+            acc_y += c * y[i]
+            i += 1
+        y_new = self._a0 * (acc_x - acc_y)
+        if ny:
+            i = self._yi = (self._yi - 1) % ny
+            y[i] = y[i + ny] = y_new
         return y_new
 
     def filter_list(self, xn: list):
@@ -41,10 +118,30 @@ class Filter:
         :param xn: the input vector
         :return: the filter output vector
         """
-        y = []
-        for x in xn:
-            y.append(self.filter_value(x))
-        return y
+        return self.filter_block(xn).tolist()
+
+    def filter_block(self, xn):
+        """
+        Passes an array of values through the filter. The input terms are vectorized, the feedback is evaluated
+        sample by sample, so the output is identical to calling filter_value for each value (except for long FIR
+        filters, which use FFT convolution). The filter state is carried across calls, so block and single value
+        calls can be mixed freely.
+
+        :param xn: the input vector (list or 1D numpy array)
+        :return: the filter output vector as a numpy array
+        """
+        x = np.asarray(xn, dtype=float).reshape(-1, 1)
+        if len(x) * (len(self._b) + len(self._a)) < BLOCK_MIN_PRODUCTS:
+            # Too short to pay for the block setup
+            filter_value = self.filter_value
+            return np.array([filter_value(v) for v in x[:, 0].tolist()])
+        x_hist = np.array(self.input, dtype=float).reshape(-1, 1)
+        y_hist = np.array(self.output, dtype=float).reshape(-1, 1)
+        y, _, y_hist = self._get_kernel().process(x, x_hist[:-1], y_hist)
+        if len(x_hist):
+            x_hist = np.concatenate((x_hist[::-1], x[-len(x_hist):]))[-len(x_hist):][::-1]
+        self._set_history(x_hist[:, 0], y_hist[:, 0])
+        return y[:, 0]
 
     def get_latest(self):
         """
@@ -52,7 +149,7 @@ class Filter:
 
         :return: the latest output value of the filter
         """
-        return self.output[0]
+        return self._y[self._yi]
 
     def clear(self):
         """
@@ -60,17 +157,35 @@ class Filter:
 
         :return: None
         """
-        self.input = [0] * len(self.input)
-        self.output = [0] * len(self.output)
+        self._x = [0] * len(self._x)
+        self._y = [0] * len(self._y)
+        self._xi = self._yi = 0
+
+    def _set_history(self, x_hist, y_hist):
+        """
+        Replaces the stored input and output history
+
+        :param x_hist: the latest inputs, newest first
+        :param y_hist: the latest outputs, newest first
+        :return: None
+        """
+        x_hist, y_hist = list(x_hist), list(y_hist)
+        self._x, self._y = x_hist * 2, y_hist * 2
+        self._xi = self._yi = 0
 
-    def _shift_list(self, lst: list, val: float):
-        if len(lst) > 0:
-            lst.pop()
-            lst.insert(0, val)
-        return lst
+    def _get_kernel(self):
+        if self._kernel is None:
+            self._kernel = _make_kernel(self.b, self.a)
+        return self._kernel
 
 
 class MultiChannelFilter:
+    """
+    Filter for multiple signals sharing the same coefficients. The history of all channels is stored as
+    channels x order arrays (ring buffers as in Filter), so every channel is updated by one vectorized operation.
+    """
+
+    __slots__ = ('channels', '_b', '_a', '_a0', 'k', '_x', '_y', '_xi', '_yi', '_kernel')
 
     def __init__(self, channels: int, b: list, a: list = None, k: float = 1):
         """
@@ -81,10 +196,29 @@ class MultiChannelFilter:
         :param a: denominator coefficients of the transfer function (coeffs of Y)
         :param k: output gain (default 1)
         """
+        if not a:
+            a = [1]
         self.channels = channels
-        self.filters = []
-        for i in range(self.channels):
-            self.filters.append(Filter(b, a=a, k=k))
+        self._b = np.array(b, dtype=float)
+        self._a0 = a[0]
+        self._a = np.array(a[1:], dtype=float)
+        self.k = k
+        self._kernel = None
+        self.clear()
+
+    @property
+    def b(self):
+        """
+        Numerator coefficients of the transfer function (coeffs of X)
+        """
+        return self._b.tolist()
+
+    @property
+    def a(self):
+        """
+        Denominator coefficients of the transfer function (coeffs of Y)
+        """
+        return [self._a0] + self._a.tolist()
 
     def filter_values(self, values: list):
         """
@@ -93,11 +227,44 @@ class MultiChannelFilter:
         :param values: values to filter
         :return: filtered values, None if wrong number of elements
         """
-        if len(values) == self.channels:
-            filtered_values = [self.filters[i].filter_value(values[i]) for i in range(self.channels)]
-        else:
-            filtered_values = None
-        return filtered_values
+        if len(values) != self.channels:
+            return None
+        nx, ny = len(self._b), len(self._a)
+        x, y = self._x, self._y
+        if nx:
+            i = self._xi = (self._xi - 1) % nx
+            x[:, i] = values
+            x[:, i + nx] = x[:, i]
+        y_new = x[:, self._xi:self._xi + nx] @ self._b
+        if ny:
+            y_new -= y[:, self._yi:self._yi + ny] @ self._a
+        y_new *= self._a0
+        if ny:
+            i = self._yi = (self._yi - 1) % ny
+            y[:, i] = y[:, i + ny] = y_new
+        return y_new.tolist()
+
+    def filter_block(self, xn):
+        """
+        Passes a block of samples for all channels through the filter, evaluated as in Filter.filter_block.
+        The filter state is carried across calls, so block and filter_values calls can be mixed freely.
+
+        :param xn: the input array (samples x channels)
+        :return: the filtered array (samples x channels)
+        """
+        x = np.asarray(xn, dtype=float).reshape(-1, self.channels)
+        nx, ny = len(self._b), len(self._a)
+        x_hist = self._x[:, self._xi:self._xi + nx].T
+        y_hist = self._y[:, self._yi:self._yi + ny].T
+        if self._kernel is None:
+            self._kernel = _make_kernel(self.b, self.a)
+        y, _, y_hist = self._kernel.process(x, x_hist[:-1], y_hist)
+        if nx:
+            x_hist = np.concatenate((x_hist[::-1], x[-nx:]))[-nx:][::-1]
+        self._x = np.hstack((x_hist.T, x_hist.T))
+        self._y = np.hstack((y_hist.T, y_hist.T))
+        self._xi = self._yi = 0
+        return y
 
     def get_latest(self):
         """
@@ -105,4 +272,147 @@ class MultiChannelFilter:
 
         :return: each channel's latest output
         """
-        return [self.filters[i].get_latest() for i in range(self.channels)]
+        return self._y[:, self._yi].tolist()
+
+    def clear(self):
+        """
+        Clear the stored input and output history of all channels
+
+        :return: None
+        """
+        self._x = np.zeros((self.channels, 2 * len(self._b)))
+        self._y = np.zeros((self.channels, 2 * len(self._a)))
+        self._xi = self._yi = 0
+
+
+def _make_kernel(b: list, a: list):
+    """
+    Chooses the block implementation for the given coefficients: FFT convolution for long FIR filters (with the
+    direct form for short blocks), otherwise the direct form kernel
+
+    :param b: numerator coefficients of the transfer function (coeffs of X)
+    :param a: denominator coefficients of the transfer function (coeffs of Y)
+    :return: the block kernel
+    """
+    if len(a) == 1 and len(b) >= FFT_MIN_TAPS:
+        return _LongFIRKernel(b, a)
+    return _DirectKernel(b, a)
+
+
+class _LongFIRKernel:
+    """
+    Chooses per block between FFT convolution and the direct form, so streaming short chunks stays cheap
+    """
+
+    def __init__(self, b: list, a: list):
+        self.nb = len(b) - 1
+        self.na = 0
+        self.fft = FFTConvolver([a[0] * c for c in b])
+        self.direct = _DirectKernel(b, a)
+
+    def process(self, x, x_hist, y_hist):
+        if len(x) * (self.nb + 1) < BLOCK_MIN_PRODUCTS:
+            return self.direct.process(x, x_hist, y_hist)
+        return self.fft.process(x, x_hist, y_hist)
+
+
+class _DirectKernel:
+    """
+    Block evaluation of the difference equation with the same arithmetic as Filter.filter_value, so block and
+    single value filtering give identical results.
+
+    The input terms are accumulated tap by tap for all samples at once. The feedback terms are evaluated sample by
+    sample: rewriting a high order recursion in closed form amplifies rounding errors until the output diverges.
+    With many channels each sample is one vectorized step over all channels, otherwise every channel is run as
+    a plain Python loop, which is faster for a few channels.
+    """
+
+    def __init__(self, b: list, a: list):
+        self.b = [float(c) for c in b]
+        self.a0 = float(a[0])
+        self.a = [float(c) for c in a[1:]]
+        self.nb = len(b) - 1  # length of input history
+        self.na = len(a) - 1  # length of output history
+
+    def process(self, x, x_hist, y_hist):
+        """
+        Filters a block of samples
+
+        :param x: input array (samples x channels)
+        :param x_hist: previous inputs, newest first (len(b) - 1 x channels)
+        :param y_hist: previous outputs, newest first (len(a) - 1 x channels)
+        :return: output array, updated input history, updated output history
+        """
+        n, channels = x.shape
+        if n == 0:
+            return x.copy(), x_hist, y_hist
+        padded = np.concatenate((x_hist[::-1], x))  # oldest first
+        if n > self.nb:
+            acc = np.zeros((n, channels))
+            for i, c in enumerate(self.b):
+                acc += c * padded[self.nb - i:self.nb - i + n]
+        else:
+            acc = np.array([self._convolve(column) for column in padded.T.tolist()]).T.reshape(n, channels)
+        x_hist = padded[n:][::-1].copy()
+        if not self.na:
+            return self.a0 * acc, x_hist, y_hist
+        if channels < VECTOR_MIN_CHANNELS:
+            outputs = np.array([self._recurse(acc[:, channel].tolist(), y_hist[::-1, channel].tolist())
+                                for channel in range(channels)]).T
+        else:
+            outputs = self._recurse_channels(acc, y_hist)
+        return outputs[self.na:], x_hist, outputs[:-self.na - 1:-1].copy()
+
+    def _convolve(self, column: list):
+        """
+        Input terms of a short block, the same loop as in Filter.filter_value
+
+        :param column: input history followed by the block, oldest first
+        :return: the accumulated input terms of each sample in the block
+        """
+        acc = []
+        for k in range(self.nb, len(column)):
+            acc_x = 0
+            i = k
+            for c in self.b:
+                acc_x += c * column[i]
+                i -= 1
+            acc.append(acc_x)
+        return acc
+
+    def _recurse_channels(self, acc, y_hist):
+        """
+        Feedback recursion of all channels at once, one vectorized step per sample. Each step accumulates the
+        coefficient products newest first along the first axis, the same order as in Filter.filter_value.
+
+        :param acc: accumulated input terms (samples x channels)
+        :param y_hist: previous outputs, newest first (len(a) - 1 x channels)
+        :return: the previous outputs followed by the new outputs, oldest first
+        """
+        n, channels = acc.shape
+        na = self.na
+        outputs = np.empty((na + n, channels))
+        outputs[:na] = y_hist[::-1]
+        a = np.array(self.a)[:, None]
+        reduce, multiply = np.add.reduce, np.multiply
+        for k in range(n):
+            multiply(self.a0, acc[k] - reduce(a * outputs[k:k + na][::-1], axis=0), out=outputs[k + na])
+        return outputs
+
+    def _recurse(self, acc: list, outputs: list):
+        """
+        Feedback recursion of one channel, the same loop as in Filter.filter_value
+
+        :param acc: accumulated input terms of each sample
+        :param outputs: previous outputs, oldest first, extended in place
+        :return: the previous outputs followed by the new outputs
+        """
+        a0 = self.a0
+        terms = [(c, -1 - j) for j, c in enumerate(self.a)]  # coefficient and index from the end, newest first
+        append = outputs.append
+        for acc_x in acc:
+            acc_y = 0
+            for c, i in terms:
+                acc_y += c * outputs[i]
+            append(a0 * (acc_x - acc_y))
+        return outputs
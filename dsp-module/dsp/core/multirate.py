@@ -0,0 +1,141 @@
+from math import gcd
+import numpy as np
+
+
+class Resampler:
+    """
+    Polyphase rational resampler: upsampling by up, FIR filtering and downsampling by down, computing only the
+    outputs that are kept.
+
+    The filter is split into up polyphase components E_p = b[p::up]. Output m falls on upsampled index t = m * down,
+    which is produced by component t % up applied to the inputs up to t // up. The zeros inserted by upsampling and
+    the samples discarded by downsampling are never computed.
+
+    With channels == 1, filter_value takes and returns scalars and filter_block takes and returns 1D arrays.
+    With more channels, filter_value takes a value per channel and filter_block takes (samples x channels) arrays.
+    """
+
+    def __init__(self, up: int, down: int, b: list, a: list = None, channels: int = 1):
+        """
+        Creates a resampler
+
+        :param up: the upsampling factor
+        :param down: the downsampling factor
+        :param b: the FIR filter coefficients, at the upsampled rate
+        :param a: denominator coefficients, only [a0] (a gain, as for Filter) is supported
+        :param channels: number of channels / signals to resample
+        """
+        if a and len(a) > 1:
+            raise ValueError('polyphase resampling requires an FIR filter, a must be None or [a0]')
+        a0 = a[0] if a else 1
+        self.up = up
+        self.down = down
+        self.channels = channels
+        taps = a0 * np.asarray(b, dtype=float)
+        self._q = -(-len(taps) // up)  # taps per polyphase component
+        components = np.zeros(self._q * up)
+        components[:len(taps)] = taps
+        self._phases = np.ascontiguousarray(components.reshape(self._q, up).T)
+        self._buf = None
+        self._pos = 0
+        self._next = 0
+        self.clear()
+
+    def filter_value(self, x_new):
+        """
+        Passes a single value through the resampler
+
+        :param x_new: the input value (a list of values with multiple channels)
+        :return: list of the outputs produced by this input (possibly empty)
+        """
+        q = self._q
+        pos = self._pos = (self._pos - 1) % q
+        self._buf[pos] = self._buf[pos + q] = x_new
+        window = self._buf[pos:pos + q]
+        outputs = []
+        while self._next < self.up:
+            y = self._phases[self._next] @ window
+            outputs.append(float(y[0]) if self.channels == 1 else y.tolist())
+            self._next += self.down
+        self._next -= self.up
+        return outputs
+
+    def filter_block(self, xn):
+        """
+        Passes a block of samples through the resampler in one vectorized operation.
+        The state is carried across calls, so block and single value calls can be mixed freely.
+
+        :param xn: the input vector (samples, or samples x channels)
+        :return: the resampled vector
+        """
+        x = np.asarray(xn, dtype=float).reshape(-1, self.channels)
+        n, q = len(x), self._q
+        if n == 0:
+            return x[:, 0] if self.channels == 1 else x
+        recent = self._buf[self._pos:self._pos + q][::-1]  # oldest first
+        padded = np.concatenate((recent[1:], x))
+        windows = np.lib.stride_tricks.sliding_window_view(padded, q, axis=0)
+        count = len(range(self._next, n * self.up, self.down))
+        y = np.empty((count, self.channels))
+        # The phases repeat every up / gcd outputs, and outputs sharing a phase use evenly spaced windows
+        period = self.up // gcd(self.up, self.down)
+        stride = self.down // gcd(self.up, self.down)
+        for r in range(min(period, count)):
+            t = self._next + r * self.down
+            rows = y[r::period]
+            rows[:] = windows[t // self.up::stride][:len(rows)] @ self._phases[t % self.up][::-1]
+        self._next += count * self.down - n * self.up
+        recent = padded[-q:][::-1]
+        self._buf = np.concatenate((recent, recent))
+        self._pos = 0
+        return y[:, 0] if self.channels == 1 else y
+
+    def clear(self):
+        """
+        Clear the stored input history
+
+        :return: None
+        """
+        self._buf = np.zeros((2 * self._q, self.channels))
+        self._pos = 0
+        self._next = 0
+
+
+class Decimator(Resampler):
+
+    def __init__(self, factor: int, b: list, a: list = None, channels: int = 1):
+        """
+        Creates a polyphase decimator, filtering with b and keeping every factor'th sample. Only the kept outputs are
+        computed.
+
+        :param factor: the decimation factor
+        :param b: the FIR anti aliasing filter coefficients
+        :param a: denominator coefficients, only [a0] (a gain, as for Filter) is supported
+        :param channels: number of channels / signals to decimate
+        """
+        super().__init__(1, factor, b, a=a, channels=channels)
+
+    def filter_value(self, x_new):
+        """
+        Passes a single value through the decimator
+
+        :param x_new: the input value (a list of values with multiple channels)
+        :return: the output value, None if this input produces no output
+        """
+        outputs = super().filter_value(x_new)
+        return outputs[0] if outputs else None
+
+
+class Interpolator(Resampler):
+
+    def __init__(self, factor: int, b: list, a: list = None, channels: int = 1):
+        """
+        Creates a polyphase interpolator, producing factor outputs per input. The zeros of the upsampled signal are
+        never multiplied. Note that b should have a passband gain of factor to preserve the signal amplitude.
+
+        :param factor: the interpolation factor
+        :param b: the FIR interpolation filter coefficients, at the upsampled rate
+        :param a: denominator coefficients, only [a0] (a gain, as for Filter) is supported
+        :param channels: number of channels / signals to interpolate
+        """
+        super().__init__(factor, 1, b, a=a, channels=channels)
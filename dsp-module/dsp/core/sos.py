@@ -0,0 +1,361 @@
+import numpy as np
+
+
+def tf2sos(b: list, a: list = None):
+    """
+    Converts the coefficients of a Filter to a cascade of second order sections, see zpk2sos.
+
+    The coefficients follow the Filter convention y = a[0] * (sum(b * x) - sum(a[1:] * y)), so a[0] multiplies the
+    output instead of dividing it, and SOSFilter(tf2sos(b, a)) filters like Filter(b, a).
+
+    :param b: numerator coefficients of the transfer function (coeffs of X)
+    :param a: denominator coefficients of the transfer function (coeffs of Y)
+    :return: list of sections [b0, b1, b2, a0, a1, a2] with a0 = 1
+    """
+    if not a:
+        a = [1]
+    order = max(len(b), len(a)) - 1
+    b_pad = np.zeros(order + 1)
+    a_pad = np.zeros(order + 1)
+    b_pad[:len(b)] = np.multiply(a[0], b)
+    a_pad[:len(a)] = np.multiply(a[0], a)
+    a_pad[0] = 1.0
+    nonzero = np.flatnonzero(b_pad)
+    if len(nonzero) == 0:
+        return [[0.0, 0.0, 0.0, 1.0, 0.0, 0.0]]
+    gain = b_pad[nonzero[0]]
+    return zpk2sos(np.roots(b_pad), np.roots(a_pad), gain)
+
+
+def zpk2sos(z: list, p: list, k: float):
+    """
+    Converts a transfer function H(z) = k * prod(z - z[i]) / prod(z - p[i]) to a cascade of second order sections.
+    Poles are paired with their complex conjugates, sections are ordered with the poles closest to the unit circle
+    last, and each pole pair is matched with the nearest remaining pair of zeros. The gain is put in the first section.
+
+    :param z: the zeros
+    :param p: the poles
+    :param k: the gain
+    :return: list of sections [b0, b1, b2, a0, a1, a2] with a0 = 1
+    """
+    z = np.asarray(z, dtype=complex)
+    p = np.asarray(p, dtype=complex)
+    order = max(len(z), len(p))
+    n_sections = max(1, -(-order // 2))
+    infinite = order - len(z)  # zeros at infinity, i.e. delays
+    zeros = np.concatenate((z, np.zeros(2 * n_sections - len(z) - infinite)))
+    poles = np.concatenate((p, np.zeros(2 * n_sections - len(p))))
+
+    pole_pairs = sorted(_pair_roots(poles), key=lambda pair: max(abs(pair[0]), abs(pair[1])))
+    zero_pairs = _pair_roots(zeros, infinite)
+    sections = [None] * n_sections
+    for s in reversed(range(n_sections)):
+        nearest = min(range(len(zero_pairs)), key=lambda i: _pair_distance(pole_pairs[s], zero_pairs[i]))
+        section = list(_pair_polynomial(zero_pairs.pop(nearest))) + list(_pair_polynomial(pole_pairs[s]))
+        sections[s] = section
+    sections[0][:3] = [k * c for c in sections[0][:3]]
+    return [[float(c) for c in section] for section in sections]
+
+
+def _pair_roots(roots, infinite: int = 0):
+    """
+    Pairs roots of a real polynomial: complex roots with their conjugates, zeros at infinity (None) with each other
+    and real roots with their nearest neighbour.
+
+    :param roots: the finite roots
+    :param infinite: the number of roots at infinity
+    :return: list of root pairs
+    """
+    roots = np.asarray(roots)
+    tol = 1e-9 * max(1.0, float(np.abs(roots).max(initial=0)))
+    is_real = np.abs(roots.imag) <= tol
+    real = sorted(roots[is_real].real.tolist())
+    pairs = [(complex(r), complex(r).conjugate()) for r in roots[~is_real] if r.imag > 0]
+    pairs += [(None, None)] * (infinite // 2)
+    if infinite % 2:
+        pairs.append((None, real.pop(0)))
+    pairs += [(real[i], real[i + 1]) for i in range(0, len(real), 2)]
+    return pairs
+
+
+def _pair_polynomial(pair):
+    """
+    Expands a root pair to second order polynomial coefficients in z^-1. A root at infinity contributes a delay.
+
+    :param pair: the root pair
+    :return: [c0, c1, c2]
+    """
+    poly = np.array([1.0])
+    for root in pair:
+        factor = [0.0, 1.0] if root is None else [1.0, -root]
+        poly = np.convolve(poly, factor)
+    return poly.real.tolist()
+
+
+def _pair_distance(pole_pair, zero_pair):
+    distances = [abs(p - z) for p in pole_pair for z in zero_pair if z is not None]
+    return min(distances) if distances else np.inf
+
+
+class SOSFilter:
+    """
+    Cascade of second order sections (biquads). High order IIR filters are numerically much better behaved as a
+    cascade of biquads than as a single high order difference equation.
+
+    The sections are implemented in direct form I. The output history of a section is the input history of the next
+    section, so the state is one list of histories, two values for the input and for each section output.
+    """
+
+    __slots__ = ('sections', '_coeffs', '_w', '_kernels')
+
+    def __init__(self, sos: list):
+        """
+        Creates a second order sections filter
+
+        :param sos: list of sections [b0, b1, b2, a0, a1, a2], see tf2sos
+        """
+        self.sections = [list(section) for section in sos]
+        self._coeffs = [
+            (b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0) for b0, b1, b2, a0, a1, a2 in self.sections
+        ]
+        self._kernels = None
+        self._w = None
+        self.clear()
+
+    def filter_value(self, x_new: float):
+        """
+        Passes a single value through the filter
+
+        :param x_new: the value to be passed through the filter
+        :return: the filter's output value
+        """
+        w = self._w
+        x, x1, x2 = x_new, w[0], w[1]
+        w[0], w[1] = x, x1
+        i = 2
+        for b0, b1, b2, a1, a2 in self._coeffs:
+            y1, y2 = w[i], w[i + 1]
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            w[i], w[i + 1] = y, y1
+            x, x1, x2 = y, y1, y2
+            i += 2
+        return x
+
+    def filter_list(self, xn: list):
+        """
+        Passes a list of values through the filter
+
+        :param xn: the input vector
+        :return: the filter output vector
+        """
+        return self.filter_block(xn).tolist()
+
+    def filter_block(self, xn):
+        """
+        Passes an array of values through the filter, one vectorized pass per section.
+        The filter state is carried across calls, so block and single value calls can be mixed freely.
+
+        :param xn: the input vector (list or 1D numpy array)
+        :return: the filter output vector as a numpy array
+        """
+        state = np.array(self._w, dtype=float).reshape(-1, 2, 1)
+        y = _process_sections(self._get_kernels(), np.asarray(xn, dtype=float).reshape(-1, 1), state)
+        self._w = state.reshape(-1).tolist()
+        return y[:, 0]
+
+    def get_latest(self):
+        """
+        Returns the latest output value of the filter
+
+        :return: the latest output value of the filter
+        """
+        return self._w[-2]
+
+    def clear(self):
+        """
+        Clear the filter's stored history
+
+        :return: None
+        """
+        self._w = [0.0] * (2 * len(self._coeffs) + 2)
+
+    def _get_kernels(self):
+        if self._kernels is None:
+            self._kernels = _section_kernels(self._coeffs)
+        return self._kernels
+
+
+class MultiChannelSOSFilter:
+    """
+    Second order sections filter for multiple signals sharing the same coefficients.
+    The history of all channels is stored in one (sections + 1) x 2 x channels array.
+    """
+
+    __slots__ = ('channels', 'sections', '_coeffs', '_w', '_kernels')
+
+    def __init__(self, channels: int, sos: list):
+        """
+        Creates a multi channel second order sections filter
+
+        :param channels: Number of channels / signals to filter
+        :param sos: list of sections [b0, b1, b2, a0, a1, a2], see tf2sos
+        """
+        self.channels = channels
+        self.sections = [list(section) for section in sos]
+        self._coeffs = [
+            (b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0) for b0, b1, b2, a0, a1, a2 in self.sections
+        ]
+        self._kernels = None
+        self._w = None
+        self.clear()
+
+    def filter_values(self, values: list):
+        """
+        Filters values
+
+        :param values: values to filter
+        :return: filtered values, None if wrong number of elements
+        """
+        if len(values) != self.channels:
+            return None
+        w = self._w
+        x = np.array(values, dtype=float)
+        x1, x2 = w[0].copy()
+        w[0, 1], w[0, 0] = x1, x
+        for s, (b0, b1, b2, a1, a2) in enumerate(self._coeffs, 1):
+            y1, y2 = w[s].copy()
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            w[s, 1], w[s, 0] = y1, y
+            x, x1, x2 = y, y1, y2
+        return x.tolist()
+
+    def filter_block(self, xn):
+        """
+        Passes a block of samples for all channels through the filter, one vectorized pass per section.
+        The filter state is carried across calls, so block and filter_values calls can be mixed freely.
+
+        :param xn: the input array (samples x channels)
+        :return: the filtered array (samples x channels)
+        """
+        if self._kernels is None:
+            self._kernels = _section_kernels(self._coeffs)
+        x = np.asarray(xn, dtype=float).reshape(-1, self.channels)
+        return _process_sections(self._kernels, x, self._w)
+
+    def get_latest(self):
+        """
+        Returns each channel's latest output as a list
+
+        :return: each channel's latest output
+        """
+        return self._w[-1, 0].tolist()
+
+    def clear(self):
+        """
+        Clear the stored history of all channels
+
+        :return: None
+        """
+        self._w = np.zeros((len(self._coeffs) + 1, 2, self.channels))
+
+
+def _section_kernels(coeffs):
+    return [_BlockKernel([b0, b1, b2], [1, a1, a2]) for b0, b1, b2, a1, a2 in coeffs]
+
+
+def _process_sections(kernels, x, state):
+    """
+    Passes a block through each section in turn, updating the state in place
+
+    :param kernels: block kernels of the sections
+    :param x: the input array (samples x channels)
+    :param state: histories, newest first ((sections + 1) x 2 x channels)
+    :return: the output array
+    """
+    history = state.copy()  # every section starts from the histories as they were before the block
+    for s, kernel in enumerate(kernels):
+        x, state[s], state[s + 1] = kernel.process(x, history[s], history[s + 1])
+    return x
+
+
+class _BlockKernel:
+    """
+    Closed form block formulation of the difference equation of a second order section. Higher order recursions are
+    ill conditioned in this form, Filter evaluates them directly instead.
+
+    The output of a block of L samples is a linear function of the block's inputs and the filter history:
+    y = T(h) @ x + Sx @ x_hist + Sy @ y_hist, where h is the impulse response and Sx, Sy are the responses to
+    unit initial conditions. These matrices are found once by running the recursion on unit inputs. The input
+    dependent terms are then evaluated for all blocks with one matrix product, leaving only the small feedback
+    term Sy @ y_hist to be evaluated block by block.
+    """
+
+    def __init__(self, b: list, a: list, block_size: int = 64):
+        self.nb = len(b) - 1  # length of input history
+        self.na = len(a) - 1  # length of output history
+        self.block_size = max(block_size, self.na)
+        response = self._unit_responses(b, a, self.block_size)
+        h = response[:, 0]
+        lags = np.subtract.outer(np.arange(self.block_size), np.arange(self.block_size))
+        toeplitz = np.where(lags >= 0, h[np.clip(lags, 0, None)], 0.0)
+        # Histories are stored newest first, the windows below are oldest first, hence the column reversal
+        sx = response[:, 1:1 + self.nb][:, ::-1]
+        self.sy = np.ascontiguousarray(response[:, 1 + self.nb:][:, ::-1].T)
+        self.kx = np.ascontiguousarray(np.hstack((sx, toeplitz)).T)
+
+    @staticmethod
+    def _unit_responses(b, a, steps):
+        """
+        Runs the difference equation for a unit impulse and for each unit initial condition
+
+        :return: matrix of responses, one column for each case
+        """
+        nb, na = len(b) - 1, len(a) - 1
+        cases = 1 + nb + na
+        x_win = np.zeros((nb + 1, cases))
+        y_win = np.zeros((na, cases))
+        x_win[:nb, 1:1 + nb] = np.eye(nb)
+        y_win[:, 1 + nb:] = np.eye(na)
+        bv = np.array(b, dtype=float)
+        av = np.array(a[1:], dtype=float)
+        response = np.empty((steps, cases))
+        for n in range(steps):
+            x_win[1:] = x_win[:-1].copy()
+            x_win[0] = 0.0
+            if n == 0:
+                x_win[0, 0] = 1.0
+            y = a[0] * (bv @ x_win - av @ y_win)
+            if na:
+                y_win[1:] = y_win[:-1].copy()
+                y_win[0] = y
+            response[n] = y
+        return response
+
+    def process(self, x, x_hist, y_hist):
+        """
+        Filters a block of samples
+
+        :param x: input array (samples x channels)
+        :param x_hist: previous inputs, newest first (len(b) - 1 x channels)
+        :param y_hist: previous outputs, newest first (len(a) - 1 x channels)
+        :return: output array, updated input history, updated output history
+        """
+        n, channels = x.shape
+        if n == 0:
+            return x.copy(), x_hist, y_hist
+        size = self.block_size
+        blocks = -(-n // size)
+        padded = np.zeros((self.nb + blocks * size, channels))
+        padded[:self.nb] = x_hist[::-1]
+        padded[self.nb:self.nb + n] = x
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.nb + size, axis=0)[::size]
+        y = windows @ self.kx  # (blocks, channels, size)
+        if self.na:
+            tail = np.ascontiguousarray(y_hist[::-1].T)  # (channels, na), oldest first
+            for block in y:
+                block += tail @ self.sy
+                tail = block[:, size - self.na:]
+        y = y.transpose(0, 2, 1).reshape(-1, channels)[:n]
+        x_hist = padded[n:self.nb + n][::-1].copy()
+        y_hist = np.concatenate((y_hist[::-1], y))[len(y):][::-1].copy() if self.na else y_hist
+        return y, x_hist, y_hist
@@ -0,0 +1,165 @@
+from itertools import islice
+import numpy as np
+
+
+def chunked(samples, size: int):
+    """
+    Splits a signal into chunks of fixed size. Arrays are sliced without copying, other iterables (e.g. generators
+    of samples or of multichannel rows) are consumed lazily. The last chunk may be shorter.
+
+    :param samples: the signal as an array or iterable of samples
+    :param size: number of samples per chunk
+    :return: generator of numpy array chunks
+    """
+    if isinstance(samples, np.ndarray):
+        for start in range(0, len(samples), size):
+            yield samples[start:start + size]
+    else:
+        iterator = iter(samples)
+        chunk = list(islice(iterator, size))
+        while chunk:
+            yield np.asarray(chunk, dtype=float)
+            chunk = list(islice(iterator, size))
+
+
+class Stage:
+    """
+    Base class for pipeline stages. A stage transforms a stream of chunks into a new stream of chunks and keeps
+    whatever state it needs between chunks. Subclasses implement process.
+    """
+
+    def process(self, chunk):
+        """
+        Processes a single chunk
+
+        :param chunk: the input chunk (samples, or samples x channels)
+        :return: the output chunk
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """
+        Resets the stage's state
+
+        :return: None
+        """
+        pass
+
+    def __call__(self, chunks):
+        for chunk in chunks:
+            out = self.process(chunk)
+            if out is not None and len(out):
+                yield out
+
+
+class FilterStage(Stage):
+
+    def __init__(self, flt):
+        """
+        Creates a stage passing each chunk through a filter
+
+        :param flt: a Filter or MultiChannelFilter (or any object with filter_block and clear)
+        """
+        self.filter = flt
+
+    def process(self, chunk):
+        return self.filter.filter_block(chunk)
+
+    def reset(self):
+        self.filter.clear()
+
+
+class GainStage(Stage):
+
+    def __init__(self, gain: float):
+        """
+        Creates a stage multiplying each chunk with a gain
+
+        :param gain: the gain, a scalar or one value per channel
+        """
+        self.gain = gain
+
+    def process(self, chunk):
+        return np.asarray(chunk) * self.gain
+
+
+class DecimateStage(Stage):
+
+    def __init__(self, factor: int):
+        """
+        Creates a stage keeping every factor'th sample. The stage does not filter, so it should be preceded by an
+        anti aliasing FilterStage.
+
+        :param factor: the decimation factor
+        """
+        self.factor = factor
+        self.offset = 0
+
+    def process(self, chunk):
+        out = chunk[self.offset::self.factor]
+        self.offset = (self.offset - len(chunk)) % self.factor
+        return out
+
+    def reset(self):
+        self.offset = 0
+
+
+class SinkStage(Stage):
+
+    def __init__(self, func):
+        """
+        Creates a stage passing each chunk to a function, e.g. for storing or plotting it.
+        The stage ends the stream, no chunks are passed on.
+
+        :param func: the function to call with each chunk
+        """
+        self.func = func
+
+    def process(self, chunk):
+        self.func(chunk)
+        return None
+
+
+class Pipeline:
+    """
+    A chain of stages. Chunks are pulled through the stages one at a time, so memory use depends on the chunk size
+    and not on the length of the stream.
+    """
+
+    def __init__(self, *stages: Stage):
+        """
+        Creates a pipeline
+
+        :param stages: the stages, in processing order
+        """
+        self.stages = list(stages)
+
+    def stream(self, chunks):
+        """
+        Connects the stages to a source of chunks
+
+        :param chunks: iterable of input chunks (see chunked)
+        :return: generator of output chunks
+        """
+        for stage in self.stages:
+            chunks = stage(chunks)
+        return chunks
+
+    def run(self, chunks):
+        """
+        Runs the entire stream through the pipeline, discarding any output. Used when the pipeline ends in a sink.
+
+        :param chunks: iterable of input chunks (see chunked)
+        :return: None
+        """
+        for _ in self.stream(chunks):
+            pass
+
+    def reset(self):
+        """
+        Resets the state of all stages
+
+        :return: None
+        """
+        for stage in self.stages:
+            stage.reset()
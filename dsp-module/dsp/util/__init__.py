@@ -1,2 +1,28 @@
-from dsp.util.analysis import *
-from dsp.util.helper_functions import *
+from dsp._lazy import lazy_module
+
+# Names are imported from their module on first use, so unused modules are never loaded
+_ATTRIBUTES = {
+    'get_frequency_response': 'analysis',
+    'frequency_grid': 'analysis',
+    'amplitude2db': 'analysis',
+    'db2amplitude': 'analysis',
+    'DesignTable': 'design',
+    'use_design_table': 'design',
+    'clear_design_cache': 'design',
+    'butterworth': 'design',
+    'chebyshev1': 'design',
+    'fir_window': 'design',
+    'generate_signal': 'helper_functions',
+    'multi_tone': 'helper_functions',
+    'chirp': 'helper_functions',
+    'noise': 'helper_functions',
+    'step': 'helper_functions',
+    'signal_chunks': 'helper_functions',
+    'add_signals': 'helper_functions',
+    'mix_signals': 'helper_functions',
+    'spectral_window': 'spectral',
+    'STFT': 'spectral',
+    'WelchPSD': 'spectral',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, attributes=_ATTRIBUTES)
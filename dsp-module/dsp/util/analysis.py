@@ -1,52 +1,87 @@
-from math import cos, sin, atan2, pi, log
+from functools import lru_cache
+import numpy as np
 
 
-def get_frequency_response(b, a: list = None, k: float = 1, steps: int = 1001):
+def get_frequency_response(b, a: list = None, k: float = 1, steps: int = 1001, w=None, scale: str = 'linear'):
     """
-    Calculates the frequency response of a given filter with coefficients a and b
+    Calculates the frequency response of a given filter with coefficients a and b.
+    The response is evaluated for all frequencies at once and cached, so repeated calls with the same
+    coefficients and frequency grid only copy the cached response.
 
     :param b: numerator coefficients of the transfer function (coeffs of X)
     :param a: denominator coefficients of the transfer function (coeffs of Y)
     :param k: output gain (default 1)
     :param steps: frequency resolution
-    :return: magnitude, phase, normalized frequency
+    :param w: normalized frequencies (1 = Nyquist) to evaluate, overrides steps and scale
+    :param scale: 'linear' or 'log' spacing of the frequency grid
+    :return: magnitude, phase, normalized frequency as lists
     """
     if not a:
-        a = [0]
-    A = len(a)
-    B = len(b)
-    W = [i / steps for i in range(steps)]
-    magnitude = []
-    phase = []
-    for w in W:
-        w *= pi
-        ar = sum([ha * cos((1 - A + na) * w) for ha, na in zip(a, range(A))])
-        br = sum([hb * cos((1 - B + nb) * w) for hb, nb in zip(b, range(B))])
-        aj = sum([ha * sin((1 - A + na) * w) for ha, na in zip(a, range(A))])
-        bj = sum([hb * sin((1 - B + nb) * w) for hb, nb in zip(b, range(B))])
-        H = complex(br, bj) / complex(ar, aj)
-        magnitude.append(k * abs(H))
-        phase.append(-atan2(H.imag, H.real))
+        a = [1]
+    if w is not None:
+        w = tuple(np.asarray(w, dtype=float).tolist())
+    magnitude, phase, W = _frequency_response(tuple(b), tuple(a), k, steps, w, scale)
+    return magnitude.tolist(), phase.tolist(), W.tolist()
+
+
+def frequency_grid(steps: int = 1001, scale: str = 'linear'):
+    """
+    Creates a normalized frequency grid from 0 (log scale: 1 / steps) up to but not including the Nyquist frequency
+
+    :param steps: number of frequencies
+    :param scale: 'linear' or 'log'
+    :return: the normalized frequencies (1 = Nyquist)
+    """
+    if scale == 'linear':
+        return np.arange(steps) / steps
+    if scale == 'log':
+        return np.geomspace(1 / steps, 1, steps, endpoint=False)
+    raise ValueError(f'scale must be "linear" or "log", got {scale}')
+
+
+@lru_cache(maxsize=64)
+def _frequency_response(b: tuple, a: tuple, k: float, steps: int, w: tuple, scale: str):
+    uniform = w is None and scale == 'linear'
+    W = frequency_grid(steps, scale) if w is None else np.array(w)
+    hb = _evaluate(b, W, uniform)
+    ha = _evaluate(a, W, uniform)
+    H = hb / ha
+    magnitude = k * np.abs(H)
+    phase = -np.arctan2(H.imag, H.real)
+    for array in (magnitude, phase, W):
+        array.flags.writeable = False
     return magnitude, phase, W
 
 
-def amplitude2db(amp: list):
+def _evaluate(coeffs: tuple, W, uniform: bool):
+    """
+    Evaluates sum(c[n] * exp(j * (1 - N + n) * w)) for all w in W, with w in units of pi. Uniform grids
+    (W = i / steps) are evaluated with a zero padded FFT, other grids by polynomial evaluation.
+    """
+    n = len(coeffs)
+    w = np.pi * W
+    if uniform and n <= 2 * len(W):
+        values = np.conj(np.fft.fft(np.asarray(coeffs, dtype=float), 2 * len(W))[:len(W)])
+    else:
+        values = np.polyval(np.asarray(coeffs, dtype=float)[::-1], np.exp(1j * w))
+    return values * np.exp(1j * (1 - n) * w)
+
+
+def amplitude2db(amp):
     """
     Convert amplitude to decibel scale
 
-    :param amp: the amplitude
+    :param amp: the amplitude (scalar, list or array)
     :return: the amplitude as decibel
     """
-    db = [20 * log(a, 10) for a in amp]
-    return db
+    return 20 * np.log10(amp)
 
 
-def db2amplitude(db: list):
+def db2amplitude(db):
     """
     Convert decibel to amplitude
 
-    :param db: the decibel value
+    :param db: the decibel value (scalar, list or array)
     :return: the amplitude value
     """
-    amp = [pow(10, (d / 20)) for d in db]
-    return amp
+    return np.power(10.0, np.divide(db, 20))
@@ -0,0 +1,221 @@
+import functools
+import inspect
+import json
+import os
+from threading import Lock
+import numpy as np
+from dsp.core.sos import zpk2sos
+
+_cache = {}
+_cache_lock = Lock()
+_table = None
+
+
+class DesignTable:
+    """
+    A JSON file of filter designs, keyed on the design function and its parameters. Used to store designs between
+    program launches, see use_design_table.
+    """
+
+    def __init__(self, path: str):
+        """
+        Creates a design table, loading the file if it exists
+
+        :param path: path to the JSON file
+        """
+        self.path = path
+        self.designs = {}
+        if os.path.exists(path):
+            with open(path, 'r') as fh:
+                self.designs = json.load(fh)
+
+    def get(self, key: str):
+        """
+        Looks up a design
+
+        :param key: the design key
+        :return: the design, None if not in the table
+        """
+        return self.designs.get(key)
+
+    def put(self, key: str, design):
+        """
+        Adds a design and writes the table to disk
+
+        :param key: the design key
+        :param design: the design (JSON compatible)
+        :return: None
+        """
+        self.designs[key] = design
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as fh:
+            json.dump(self.designs, fh)
+        os.replace(tmp_path, self.path)
+
+
+def use_design_table(path: str = None):
+    """
+    Enables a persistent table of designs. Designs missing from the in-memory cache are looked up in the table
+    before they are computed, and new designs are added to it.
+
+    :param path: path to the JSON file, None disables the table
+    :return: the DesignTable, or None
+    """
+    global _table
+    with _cache_lock:
+        _table = DesignTable(path) if path else None
+    return _table
+
+
+def clear_design_cache():
+    """
+    Clears the in-memory design cache (the design table is left untouched)
+
+    :return: None
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cached_design(func):
+    """
+    Memoizes a design function on its parameters, in memory and, if enabled, in the design table.
+    Designs are returned as (nested) tuples, so the cached coefficients cannot be modified by the caller.
+    NumPy scalar parameters are converted to Python numbers, for the key and for the call of the design function.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        for name, value in bound.arguments.items():
+            bound.arguments[name] = _to_python(value)
+        key = json.dumps([func.__name__, bound.arguments])
+        with _cache_lock:
+            if key in _cache:
+                return _cache[key]
+            design = _table.get(key) if _table is not None else None
+        if design is None:
+            design = _to_json(func(*bound.args, **bound.kwargs))
+            with _cache_lock:
+                if _table is not None:
+                    _table.put(key, design)
+        design = _freeze(design)
+        with _cache_lock:
+            _cache[key] = design
+        return design
+    return wrapper
+
+
+def _to_python(value):
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_python(v) for v in value)
+    if isinstance(value, (np.generic, np.ndarray)) and np.ndim(value) == 0:
+        return value.item()
+    return value
+
+
+def _to_json(value):
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(v) for v in value]
+    return float(value)
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@_cached_design
+def butterworth(order: int, cutoff: float, btype: str = 'low', output: str = 'ba'):
+    """
+    Designs a Butterworth IIR filter using the bilinear transform
+
+    :param order: the filter order
+    :param cutoff: the -3 dB frequency, normalized (1 = Nyquist)
+    :param btype: 'low' or 'high'
+    :param output: 'ba' for (b, a) coefficients or 'sos' for second order sections
+    :return: (b, a) or sections, see output
+    """
+    m = np.arange(-order + 1, order, 2)
+    poles = -np.exp(1j * np.pi * m / (2 * order))
+    return _digital_design(np.array([]), poles, 1.0, cutoff, btype, output)
+
+
+@_cached_design
+def chebyshev1(order: int, ripple: float, cutoff: float, btype: str = 'low', output: str = 'ba'):
+    """
+    Designs a Chebyshev type I IIR filter using the bilinear transform
+
+    :param order: the filter order
+    :param ripple: the passband ripple in dB
+    :param cutoff: the passband edge frequency, normalized (1 = Nyquist)
+    :param btype: 'low' or 'high'
+    :param output: 'ba' for (b, a) coefficients or 'sos' for second order sections
+    :return: (b, a) or sections, see output
+    """
+    eps = np.sqrt(10 ** (0.1 * ripple) - 1.0)
+    mu = np.arcsinh(1 / eps) / order
+    m = np.arange(-order + 1, order, 2)
+    poles = -np.sinh(mu + 1j * np.pi * m / (2 * order))
+    gain = np.prod(-poles).real
+    if order % 2 == 0:
+        gain /= np.sqrt(1 + eps ** 2)
+    return _digital_design(np.array([]), poles, gain, cutoff, btype, output)
+
+
+@_cached_design
+def fir_window(taps: int, cutoff: float, btype: str = 'low', window: str = 'hamming'):
+    """
+    Designs a linear phase FIR filter with the windowed sinc method
+
+    :param taps: number of taps (must be odd for highpass filters)
+    :param cutoff: the -6 dB frequency, normalized (1 = Nyquist)
+    :param btype: 'low' or 'high'
+    :param window: 'hamming', 'hann', 'blackman' or 'rectangular'
+    :return: (b, a) with a = [1]
+    """
+    windows = {'hamming': np.hamming, 'hann': np.hanning, 'blackman': np.blackman, 'rectangular': np.ones}
+    if window not in windows:
+        raise ValueError(f'unknown window {window}')
+    n = np.arange(taps) - (taps - 1) / 2
+    h = cutoff * np.sinc(cutoff * n) * windows[window](taps)
+    h /= h.sum()
+    if btype == 'high':
+        if taps % 2 == 0:
+            raise ValueError('highpass FIR filters need an odd number of taps')
+        h = -h
+        h[taps // 2] += 1
+    elif btype != 'low':
+        raise ValueError(f'btype must be "low" or "high", got {btype}')
+    return h, [1.0]
+
+
+def _digital_design(zeros, poles, gain, cutoff, btype, output):
+    """
+    Transforms an analog lowpass prototype (cutoff 1 rad/s) to the requested digital filter: frequency prewarping,
+    lowpass/highpass transformation and the bilinear transform.
+    """
+    fs = 2.0
+    warped = 2 * fs * np.tan(np.pi * cutoff / fs)
+    degree = len(poles) - len(zeros)
+    if btype == 'low':
+        zeros, poles = warped * zeros, warped * poles
+        gain = gain * warped ** degree
+    elif btype == 'high':
+        gain = gain * np.real(np.prod(-zeros) / np.prod(-poles))
+        zeros = np.concatenate((warped / zeros, np.zeros(degree)))
+        poles = warped / poles
+    else:
+        raise ValueError(f'btype must be "low" or "high", got {btype}')
+    degree = len(poles) - len(zeros)
+    gain = gain * np.real(np.prod(2 * fs - zeros) / np.prod(2 * fs - poles))
+    zeros = np.concatenate(((2 * fs + zeros) / (2 * fs - zeros), -np.ones(degree)))
+    poles = (2 * fs + poles) / (2 * fs - poles)
+    if output == 'sos':
+        return zpk2sos(zeros, poles, gain)
+    if output != 'ba':
+        raise ValueError(f'output must be "ba" or "sos", got {output}')
+    return gain * np.poly(zeros).real, np.poly(poles).real
@@ -1,4 +1,4 @@
-from math import sin, pi
+import numpy as np
 
 
 def generate_signal(f, fs, A, DC, t_final, t_steps=1000):
@@ -13,23 +13,118 @@ def generate_signal(f, fs, A, DC, t_final, t_steps=1000):
     :param t_steps: number of steps for time vector
     :return: x(n), t(n), x(t), t
     """
-    w = 2 * pi * f / fs
-    T = [t_final * i / t_steps for i in range(t_steps)]
+    T = t_final * np.arange(t_steps) / t_steps
     N = int(t_final * fs)
-    tn = [i / fs for i in range(N)]
-    xn = [A * sin(w * n) + DC for n in range(N)]
-    xt = [A * sin(2 * pi * f * t) + DC for t in T]
+    tn = np.arange(N) / fs
+    xn = A * np.sin(2 * np.pi * f / fs * np.arange(N)) + DC
+    xt = A * np.sin(2 * np.pi * f * T) + DC
     return xn, tn, xt, T
 
 
-def add_signals(sig1: list, sig2: list):
+def multi_tone(freqs: list, amps: list, fs, n: int, start: int = 0, phases: list = None, DC=0):
     """
-    Sums two signal lists together
+    Generate a sum of sine waves
 
-    :param sig1: signal 1
-    :param sig2: signal 2
-    :return: new summed signal
+    :param freqs: the tone frequencies
+    :param amps: the tone amplitudes
+    :param fs: the sampling frequency
+    :param n: number of samples
+    :param start: index of the first sample
+    :param phases: the tone phases in radians (default 0)
+    :param DC: an added dc component of the signal
+    :return: x(n)
+    """
+    t = np.arange(start, start + n) / fs
+    phases = np.zeros(len(freqs)) if phases is None else np.asarray(phases, dtype=float)
+    x = np.full(n, float(DC))
+    for f, A, phi in zip(freqs, amps, phases):
+        x += A * np.sin(2 * np.pi * f * t + phi)
+    return x
+
+
+def chirp(f0, f1, t1, fs, n: int, start: int = 0, A=1):
     """
-    if len(sig1) != len(sig2):
+    Generate a linear chirp, sweeping from f0 at t = 0 to f1 at t = t1
+
+    :param f0: frequency at t = 0
+    :param f1: frequency at t = t1
+    :param t1: time at which f1 is reached
+    :param fs: the sampling frequency
+    :param n: number of samples
+    :param start: index of the first sample
+    :param A: the amplitude
+    :return: x(n)
+    """
+    t = np.arange(start, start + n) / fs
+    return A * np.sin(2 * np.pi * (f0 * t + (f1 - f0) / (2 * t1) * t ** 2))
+
+
+def noise(n: int, std=1, mean=0, rng=None, start: int = 0):
+    """
+    Generate gaussian white noise
+
+    :param n: number of samples
+    :param std: the standard deviation
+    :param mean: the mean value
+    :param rng: a numpy Generator, for reproducible noise
+    :param start: unused, accepted for consistency with the other generators (see signal_chunks)
+    :return: x(n)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.normal(mean, std, n)
+
+
+def step(n: int, n_step: int, A=1, start: int = 0, DC=0):
+    """
+    Generate a step signal
+
+    :param n: number of samples
+    :param n_step: sample index of the step
+    :param A: the step height
+    :param start: index of the first sample
+    :param DC: the value before the step
+    :return: x(n)
+    """
+    return np.where(np.arange(start, start + n) >= n_step, A + DC, DC).astype(float)
+
+
+def signal_chunks(generator, chunk_size: int, total: int = None, **kwargs):
+    """
+    Lazily generates a signal in fixed size chunks, e.g. signal_chunks(multi_tone, 4096, freqs=[50], amps=[1], fs=1e3).
+    The generator is called with n and start for each chunk, so the chunks form one continuous signal.
+    Memory use is bounded by the chunk size, the stream is unbounded if total is None.
+
+    :param generator: a signal function taking n and start (multi_tone, chirp, noise, step)
+    :param chunk_size: number of samples per chunk
+    :param total: total number of samples, None for an unbounded stream
+    :param kwargs: further arguments for the generator
+    :return: generator of numpy array chunks
+    """
+    start = 0
+    while total is None or start < total:
+        n = chunk_size if total is None else min(chunk_size, total - start)
+        yield generator(n=n, start=start, **kwargs)
+        start += n
+
+
+def add_signals(*signals):
+    """
+    Sums signals together
+
+    :param signals: the signals (lists or arrays of equal length)
+    :return: new summed signal, None if the lengths differ
+    """
+    if len({len(s) for s in signals}) > 1:
         return None
-    return [s1 + s2 for s1, s2 in zip(sig1, sig2)]
+    return np.sum([np.asarray(s, dtype=float) for s in signals], axis=0)
+
+
+def mix_signals(signals, gains):
+    """
+    Mixes signals with individual gains in one matrix product
+
+    :param signals: array of signals (signals x samples) or list of equal length signals
+    :param gains: one gain per signal
+    :return: the mixed signal
+    """
+    return np.asarray(gains, dtype=float) @ np.asarray(signals, dtype=float)
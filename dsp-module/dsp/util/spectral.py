@@ -0,0 +1,159 @@
+import numpy as np
+
+
+def spectral_window(name: str, n: int):
+    """
+    Creates a periodic window for spectral analysis
+
+    :param name: 'hann', 'hamming', 'blackman' or 'rectangular'
+    :param n: the window length
+    :return: the window
+    """
+    k = 2 * np.pi * np.arange(n) / n
+    if name == 'hann':
+        return 0.5 - 0.5 * np.cos(k)
+    if name == 'hamming':
+        return 0.54 - 0.46 * np.cos(k)
+    if name == 'blackman':
+        return 0.42 - 0.5 * np.cos(k) + 0.08 * np.cos(2 * k)
+    if name == 'rectangular':
+        return np.ones(n)
+    raise ValueError(f'unknown window {name}')
+
+
+class STFT:
+    """
+    Incremental short time Fourier transform. Chunks of any size are fed to update, which returns the spectra of
+    all segments completed by the chunk. Only the samples needed for the next segment are kept between chunks.
+    """
+
+    def __init__(self, segment_size: int, hop: int = None, window: str = 'hann', fs: float = 1):
+        """
+        Creates an incremental STFT
+
+        :param segment_size: number of samples per segment (FFT length)
+        :param hop: number of samples between segment starts (default segment_size // 2)
+        :param window: the window name, see spectral_window
+        :param fs: the sampling frequency
+        """
+        self.segment_size = segment_size
+        self.hop = hop or segment_size // 2
+        self.fs = fs
+        self.window = spectral_window(window, segment_size)
+        self.frequencies = np.fft.rfftfreq(segment_size, 1 / fs)
+        self._buffer = np.empty(0)
+        self._skip = 0  # samples to discard before the next segment starts (hop > segment_size)
+        self._scratch = np.empty((0, segment_size))
+
+    def update(self, chunk):
+        """
+        Adds a chunk of samples
+
+        :param chunk: the new samples
+        :return: complex spectra of the completed segments (segments x frequencies)
+        """
+        x = np.asarray(chunk, dtype=float)
+        if self._skip:
+            dropped = min(self._skip, len(x))
+            x = x[dropped:]
+            self._skip -= dropped
+        data = np.concatenate((self._buffer, x))
+        count = max(0, (len(data) - self.segment_size) // self.hop + 1)
+        if count == 0:
+            self._buffer = data
+            return np.empty((0, len(self.frequencies)), dtype=complex)
+        if len(self._scratch) < count:
+            self._scratch = np.empty((count, self.segment_size))
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.segment_size)[:count * self.hop:self.hop]
+        windowed = np.multiply(segments, self.window, out=self._scratch[:count])
+        spectra = np.fft.rfft(windowed, axis=-1)
+        consumed = count * self.hop
+        self._buffer = data[consumed:].copy()
+        self._skip = max(0, consumed - len(data))
+        return spectra
+
+    def reset(self):
+        """
+        Discards the buffered samples
+
+        :return: None
+        """
+        self._buffer = np.empty(0)
+        self._skip = 0
+
+
+class WelchPSD:
+    """
+    Running Welch power spectral density estimate of a stream. Segment power spectra from an incremental STFT are
+    accumulated either as a mean over the whole stream or as an exponentially weighted average, so memory use does
+    not grow with the length of the stream.
+    """
+
+    def __init__(self, segment_size: int, overlap: float = 0.5, window: str = 'hann', fs: float = 1, alpha: float = None):
+        """
+        Creates a running Welch PSD estimator
+
+        :param segment_size: number of samples per segment (FFT length)
+        :param overlap: fraction of overlap between segments
+        :param window: the window name, see spectral_window
+        :param fs: the sampling frequency
+        :param alpha: weight of each new segment for exponential averaging, None for the mean of all segments
+        """
+        hop = max(1, int(round(segment_size * (1 - overlap))))
+        self.stft = STFT(segment_size, hop=hop, window=window, fs=fs)
+        self.alpha = alpha
+        self.segments = 0
+        # one-sided density scaling, bins other than DC and Nyquist hold the power of both sides
+        self._scale = np.full(len(self.stft.frequencies), 2 / (fs * np.sum(self.stft.window ** 2)))
+        self._scale[0] /= 2
+        if segment_size % 2 == 0:
+            self._scale[-1] /= 2
+        self._power = np.zeros(len(self.stft.frequencies))
+
+    @property
+    def frequencies(self):
+        """
+        The frequencies of the PSD bins
+        """
+        return self.stft.frequencies
+
+    @property
+    def psd(self):
+        """
+        The current power spectral density estimate
+        """
+        if self.alpha is None and self.segments:
+            return self._power / self.segments
+        return self._power.copy()
+
+    def update(self, chunk):
+        """
+        Adds a chunk of samples to the estimate
+
+        :param chunk: the new samples
+        :return: the current PSD estimate
+        """
+        spectra = self.stft.update(chunk)
+        power = (spectra.real ** 2 + spectra.imag ** 2) * self._scale
+        if self.alpha is None:
+            self._power += power.sum(axis=0)
+        else:
+            for segment_power in power:
+                if self.segments:
+                    self._power += self.alpha * (segment_power - self._power)
+                else:
+                    self._power[:] = segment_power
+                self.segments += 1
+            return self.psd
+        self.segments += len(power)
+        return self.psd
+
+    def reset(self):
+        """
+        Discards the estimate and the buffered samples
+
+        :return: None
+        """
+        self.stft.reset()
+        self._power[:] = 0
+        self.segments = 0
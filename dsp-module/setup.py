@@ -17,7 +17,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     install_requires=requirements,
     url="https://github.com/RNatvik/rntools",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=('benchmarks',)),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,12 @@
+from dsp.util.analysis import get_frequency_response
+
+
+def test_frequency_response_returns_fresh_lists():
+    magnitude, phase, w = get_frequency_response([0.5, 0.5], [1, -0.2], steps=16)
+    assert all(isinstance(v, list) for v in (magnitude, phase, w))
+    expected = list(magnitude)
+    magnitude[0] = -1.0
+    w.append(2.0)
+    again = get_frequency_response([0.5, 0.5], [1, -0.2], steps=16)
+    assert again[0] == expected
+    assert len(again[2]) == 16
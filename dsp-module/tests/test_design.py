@@ -0,0 +1,8 @@
+import numpy as np
+from dsp.util.design import butterworth
+
+
+def test_numpy_scalar_parameters():
+    assert butterworth(np.int64(4), 0.1) == butterworth(4, 0.1)
+    assert butterworth(4, np.float32(0.25)) == butterworth(4, 0.25)
+    assert butterworth(order=np.int32(2), cutoff=np.float64(0.3), output='sos') == butterworth(2, 0.3, output='sos')
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from dsp.core.filter import Filter, MultiChannelFilter
+from dsp.util.design import butterworth, chebyshev1
+
+DESIGNS = [
+    butterworth(4, 0.002),
+    butterworth(6, 0.02),
+    butterworth(8, 0.02),
+    butterworth(10, 0.05),
+    chebyshev1(8, 1, 0.01),
+]
+
+
+def per_sample(b, a, x):
+    flt = Filter(b, a)
+    return np.array([flt.filter_value(v) for v in x])
+
+
+@pytest.mark.parametrize('b, a', DESIGNS)
+def test_filter_list_matches_filter_value(b, a):
+    x = np.random.default_rng(0).standard_normal(20000)
+    reference = per_sample(b, a, x)
+    assert np.all(np.isfinite(reference))
+    assert np.array_equal(Filter(b, a).filter_list(x.tolist()), reference)
+
+
+@pytest.mark.parametrize('chunk', [1, 5, 333])
+@pytest.mark.parametrize('b, a', DESIGNS[2:4])
+def test_chunked_blocks_match_filter_value(b, a, chunk):
+    x = np.random.default_rng(1).standard_normal(4000)
+    flt = Filter(b, a)
+    y = np.concatenate([flt.filter_block(x[i:i + chunk]) for i in range(0, len(x), chunk)])
+    assert np.array_equal(y, per_sample(b, a, x))
+
+
+@pytest.mark.parametrize('channels', [3, 8, 64])
+@pytest.mark.parametrize('b, a', DESIGNS)
+def test_multichannel_block_matches_filter_value(b, a, channels):
+    x = np.random.default_rng(2).standard_normal((2000, channels))
+    y = MultiChannelFilter(channels, b, a).filter_block(x)
+    for channel in range(channels):
+        assert np.array_equal(y[:, channel], per_sample(b, a, x[:, channel]))
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from dsp.core.filter import Filter
+from dsp.core.sos import SOSFilter, tf2sos
+from dsp.util.design import butterworth
+
+
+@pytest.mark.parametrize('b, a', [
+    ([1, 0.5], [2, -0.3]),
+    ([0, 0, 1], [0.5, 0.1, -0.2, 0.05]),
+    butterworth(6, 0.05),
+])
+def test_tf2sos_follows_filter_convention(b, a):
+    x = np.zeros(200)
+    x[0] = 1
+    flt = Filter(b, a)
+    expected = [flt.filter_value(v) for v in x]
+    actual = SOSFilter(tf2sos(b, a)).filter_list(x)
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9 * np.max(np.abs(expected)))
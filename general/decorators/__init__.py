@@ -1 +1,21 @@
-from decorators.decorator import *
+from decorators._lazy import lazy_module
+
+# Decorators are imported on first access, parallel_map pulls in multiprocessing
+_ATTRIBUTES = {
+    'timed': 'decorator',
+    'dir_active': 'decorator',
+    'clean_exit': 'decorator',
+    'enable_profiling': 'profiling',
+    'disable_profiling': 'profiling',
+    'profiling_enabled': 'profiling',
+    'Histogram': 'profiling',
+    'ProfileRegistry': 'profiling',
+    'default_registry': 'profiling',
+    'profiled': 'profiling',
+    'profile_block': 'profiling',
+    'memoize': 'caching',
+    'SHARED_MEMORY_THRESHOLD': 'parallel',
+    'parallel_map': 'parallel',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, attributes=_ATTRIBUTES)
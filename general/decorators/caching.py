@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def memoize(maxsize: int = 128, max_bytes: int = None, ttl: float = None):
+    """
+    This decorator caches the results of the decorated function. Unlike functools.lru_cache, arguments may be lists,
+    dicts, sets and NumPy arrays, which are hashed by value. The cache is thread-safe, and concurrent calls with the
+    same arguments compute the result only once while the other callers wait for it. Cached results are shared
+    between callers and must not be modified. Can be used with or without arguments.
+
+    The decorated function gets cache_info() returning hit/miss statistics and cache_clear() emptying the cache.
+    :param maxsize: maximum number of cached results, None for no limit
+    :param max_bytes: maximum estimated size of the cached results in bytes, None for no limit
+    :param ttl: seconds a result stays valid, None for no expiry
+    :return: decorated function
+    """
+    if callable(maxsize):
+        return memoize()(maxsize)
+
+    def decorator(func):
+        cache = _Cache(maxsize, max_bytes, ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get(_make_key(args, kwargs), func, args, kwargs)
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+class _Pending:
+    """
+    A result being computed by another thread
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _Cache:
+    """
+    LRU cache with size, byte and age limits
+    """
+
+    def __init__(self, maxsize, max_bytes, ttl):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expiry time, size)
+        self._pending = {}
+        self.clear()
+
+    def get(self, key, func, args, kwargs):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+                self.expired += 1
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+        try:
+            pending.value = func(*args, **kwargs)
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None:
+                    self._store(key, pending.value)
+            pending.event.set()
+        return pending.value
+
+    def _store(self, key, value):
+        size = _sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expiry = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (value, expiry, size)
+        self.bytes += size
+        while (self.maxsize is not None and len(self._entries) > self.maxsize) or \
+                (self.max_bytes is not None and self.bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        self.bytes -= self._entries.pop(key)[2]
+
+    def info(self):
+        """
+        :return: dictionary of hits, misses, evictions, expired, size and bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'size': len(self._entries),
+                'bytes': self.bytes,
+            }
+
+    def clear(self):
+        """
+        Removes all cached results and resets the statistics
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expired = 0
+            self.bytes = 0
+
+
+def _make_key(args, kwargs):
+    """
+    Creates a hashable key from function arguments
+    """
+    key = tuple(_freeze(arg) for arg in args)
+    if kwargs:
+        key += (_KWARGS,) + tuple(sorted((name, _freeze(value)) for name, value in kwargs.items()))
+    return key
+
+
+_KWARGS = object()
+
+
+def _freeze(value):
+    """
+    Converts a value to a hashable equivalent. NumPy arrays are recognized without importing NumPy and are hashed by
+    dtype, shape and content.
+    """
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return 'dict', frozenset((_freeze(k), _freeze(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return 'set', frozenset(_freeze(v) for v in value)
+    if hasattr(value, 'dtype') and hasattr(value, 'tobytes'):
+        digest = hashlib.blake2b(value.tobytes(), digest_size=16).digest()
+        return 'ndarray', str(value.dtype), getattr(value, 'shape', ()), digest
+    hash(value)
+    return value
+
+
+def _sizeof(value):
+    """
+    Estimates the memory used by a value in bytes
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
@@ -0,0 +1,258 @@
+import functools
+import importlib
+import itertools
+import multiprocessing
+from multiprocessing import resource_tracker
+import os
+import secrets
+import signal
+
+# NumPy arrays of at least this many bytes are passed through shared memory instead of being pickled
+SHARED_MEMORY_THRESHOLD = 1 << 20
+
+
+def parallel_map(processes: int = None, chunksize: int = None, shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD,
+                 exit_func=None, exit_args: tuple = (), exit_kwargs: dict = None):
+    """
+    This decorator turns a function processing one item into a function processing a list of items in a process
+    pool. The decorated function is called as func(items, *args, **kwargs) and returns the list of results in the
+    order of the items, each computed as original_func(item, *args, **kwargs). The original function is available
+    as the item attribute of the decorated function.
+
+    Items are sent to the workers in chunks. Large NumPy arrays in the items (also inside lists, tuples and dicts)
+    and in the results are transferred through shared memory instead of being pickled; such input arrays are
+    read-only in the workers. On Windows, where shared memory is freed when its last handle is closed, results are
+    always pickled.
+
+    As in clean_exit, a keyboard interrupt stops the workers, calls exit_func (if given) and returns None.
+    The original function must be defined at module level so the workers can import it.
+    :param processes: number of worker processes (default os.cpu_count()), 1 to run in this process
+    :param chunksize: number of items per task (default: about four tasks per worker)
+    :param shared_memory_threshold: minimum array size in bytes for shared memory transfer, None to always pickle
+    :param exit_func: the function to call if keyboard interrupt
+    :param exit_args: positional arguments of exit_func
+    :param exit_kwargs: keyword arguments of exit_func
+    :return: decorated function
+    """
+    if callable(processes):
+        return parallel_map()(processes)
+
+    def decorator(func):
+        reference = (func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(items, *args, **kwargs):
+            items = list(items)
+            workers = processes or os.cpu_count() or 1
+            if workers == 1 or len(items) <= 1:
+                return [func(item, *args, **kwargs) for item in items]
+            size = chunksize or max(1, -(-len(items) // (4 * workers)))
+            blocks = []
+            prefix = f'rn{secrets.token_hex(4)}'
+            result_threshold = None if os.name == 'nt' else shared_memory_threshold
+            try:
+                tasks = [
+                    (reference, [_share(item, shared_memory_threshold, blocks) for item in items[i:i + size]],
+                     args, kwargs, result_threshold, f'{prefix}_{i // size}')
+                    for i in range(0, len(items), size)
+                ]
+                if shared_memory_threshold is not None:
+                    _start_resource_tracker()
+                pool = multiprocessing.Pool(min(workers, len(tasks)), initializer=_init_worker)
+                results = []
+                received = 0
+                chunk = None
+                interrupted = False
+                try:
+                    for chunk in pool.imap(_run_chunk, tasks):
+                        results.extend(_attach(result, None) for result in chunk)
+                        received += 1
+                        chunk = None
+                    pool.close()
+                except KeyboardInterrupt:
+                    pool.terminate()
+                    interrupted = True
+                except BaseException:
+                    pool.terminate()
+                    raise
+                finally:
+                    pool.join()
+                    if received < len(tasks) and result_threshold is not None:
+                        _discard_results(chunk, tasks[received:])
+                if interrupted:
+                    if exit_func is not None:
+                        exit_func(*exit_args, **(exit_kwargs or {}))
+                    return None
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+            return results
+        wrapper.item = func
+        return wrapper
+    return decorator
+
+
+class _SharedArray:
+    """
+    Picklable description of a NumPy array stored in shared memory
+    """
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def attach(self):
+        """
+        :return: the shared memory block and an array using it
+        """
+        import numpy as np
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(name=self.name)
+        return block, np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+
+
+def _share(value, threshold, blocks, names=None):
+    """
+    Replaces large NumPy arrays in a value by shared memory copies
+    :param blocks: list the created shared memory blocks are appended to
+    :param names: iterator of names for the created blocks, None for random names
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value)(_share(v, threshold, blocks, names) for v in value)
+    if isinstance(value, dict):
+        return {k: _share(v, threshold, blocks, names) for k, v in value.items()}
+    if threshold is None or not hasattr(value, 'nbytes') or value.nbytes < threshold or value.dtype.hasobject:
+        return value
+    import numpy as np
+    from multiprocessing import shared_memory
+    name = None if names is None else next(names)
+    block = shared_memory.SharedMemory(name=name, create=True, size=max(1, value.nbytes))
+    blocks.append(block)
+    np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)[...] = value
+    return _SharedArray(block.name, value.shape, value.dtype.str)
+
+
+def _attach(value, blocks):
+    """
+    Replaces shared memory descriptions in a value by read-only arrays
+    :param blocks: list the attached shared memory blocks are appended to, None to copy the arrays and free the
+        shared memory right away
+    """
+    if isinstance(value, _SharedArray):
+        block, array = value.attach()
+        if blocks is None:
+            array = array.copy()
+            block.close()
+            block.unlink()
+        else:
+            blocks.append(block)
+            array.flags.writeable = False
+        return array
+    if isinstance(value, (list, tuple)):
+        return type(value)(_attach(v, blocks) for v in value)
+    if isinstance(value, dict):
+        return {k: _attach(v, blocks) for k, v in value.items()}
+    return value
+
+
+def _discard_results(chunk, tasks):
+    """
+    Frees the shared memory of results that were not read, after the workers have stopped
+    :param chunk: the partially read result chunk, or None
+    :param tasks: the tasks whose results were not received
+    """
+    if chunk is not None:
+        for name in _shared_names(chunk):
+            _unlink(name)
+        tasks = tasks[1:]
+    for task in tasks:
+        # Workers name their result blocks in sequence, so the first missing name ends the task's blocks
+        for k in itertools.count():
+            if not _unlink(f'{task[-1]}_{k}'):
+                break
+
+
+def _unlink(name):
+    """
+    Frees a shared memory block by name
+    :return: False if there is no block of that name
+    """
+    from multiprocessing import shared_memory
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    block.unlink()
+    return True
+
+
+def _shared_names(value):
+    """
+    :return: names of the shared memory blocks described in a value
+    """
+    if isinstance(value, _SharedArray):
+        return [value.name]
+    if isinstance(value, (list, tuple)):
+        return [name for v in value for name in _shared_names(v)]
+    if isinstance(value, dict):
+        return [name for v in value.values() for name in _shared_names(v)]
+    return []
+
+
+def _copy_arrays(value):
+    """
+    Copies the arrays in a value, so it does not reference shared memory that is about to be closed
+    """
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copy_arrays(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _copy_arrays(v) for k, v in value.items()}
+    if hasattr(value, 'nbytes') and hasattr(value, 'copy'):
+        return value.copy()
+    return value
+
+
+def _start_resource_tracker():
+    """
+    Starts the shared memory resource tracker before the workers, so they share it with this process. Otherwise a
+    worker's own tracker would report the result blocks it created, and this process frees, as leaked.
+    """
+    resource_tracker.ensure_running()
+
+
+def _init_worker():
+    # Keyboard interrupts are handled by the parent process, which terminates the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _resolve(reference):
+    """
+    Imports the original function of a parallel_map decorated function
+    """
+    module, qualname = reference
+    func = importlib.import_module(module)
+    for name in qualname.split('.'):
+        func = getattr(func, name)
+    return getattr(func, 'item', func)
+
+
+def _run_chunk(task):
+    reference, items, args, kwargs, threshold, prefix = task
+    func = _resolve(reference)
+    names = (f'{prefix}_{k}' for k in itertools.count())
+    results = []
+    for item in items:
+        blocks = []
+        result = func(_attach(item, blocks), *args, **kwargs)
+        if blocks:
+            result = _copy_arrays(result)
+        for block in blocks:
+            block.close()
+        blocks = []
+        results.append(_share(result, threshold, blocks, names))
+        for block in blocks:
+            block.close()
+    return results
@@ -0,0 +1,231 @@
+import functools
+import itertools
+import random
+import threading
+import time
+
+_enabled = True
+
+
+def enable_profiling():
+    """
+    Switches all profiled functions and blocks on
+    :return: None
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable_profiling():
+    """
+    Switches all profiled functions and blocks off. Disabled instrumentation only costs a flag check per call.
+    :return: None
+    """
+    global _enabled
+    _enabled = False
+
+
+def profiling_enabled():
+    """
+    :return: True if profiling is switched on
+    """
+    return _enabled
+
+
+class Histogram:
+    """
+    Thread-safe aggregate of durations in nanoseconds. Count, mean and max are exact, percentiles are estimated from a
+    bounded reservoir of samples so memory use does not grow with the number of calls.
+    """
+
+    def __init__(self, name: str, reservoir_size: int = 4096):
+        """
+        Creates a histogram
+        :param name: name of the measured function or block
+        :param reservoir_size: maximum number of samples kept for the percentiles
+        """
+        self.name = name
+        self.reservoir_size = reservoir_size
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.reset()
+
+    def record(self, duration_ns: int):
+        """
+        Adds a measurement
+        :param duration_ns: the duration in nanoseconds
+        :return: None
+        """
+        with self._lock:
+            self.count += 1
+            self.total += duration_ns
+            if duration_ns > self.max:
+                self.max = duration_ns
+            if len(self._samples) < self.reservoir_size:
+                self._samples.append(duration_ns)
+            else:
+                i = self._random.randrange(self.count)
+                if i < self.reservoir_size:
+                    self._samples[i] = duration_ns
+
+    @property
+    def mean(self):
+        """
+        Mean duration in nanoseconds
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float):
+        """
+        Estimates a percentile of the durations
+        :param q: the percentile (0 - 100)
+        :return: the duration in nanoseconds
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def summary(self):
+        """
+        :return: dictionary of count, mean, p50, p99 and max, durations in nanoseconds
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+    def reset(self):
+        """
+        Removes all measurements
+        :return: None
+        """
+        with self._lock:
+            self.count = 0
+            self.total = 0
+            self.max = 0
+            self._samples = []
+
+
+class ProfileRegistry:
+    """
+    Thread-safe collection of named histograms
+    """
+
+    def __init__(self, reservoir_size: int = 4096):
+        """
+        Creates a registry
+        :param reservoir_size: reservoir size of new histograms
+        """
+        self.reservoir_size = reservoir_size
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        """
+        Returns the histogram of the given name, creating it if needed
+        :param name: name of the histogram
+        :return: the histogram
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name, self.reservoir_size))
+        return histogram
+
+    def record(self, name: str, duration_ns: int):
+        """
+        Adds a measurement to a histogram
+        :param name: name of the histogram
+        :param duration_ns: the duration in nanoseconds
+        :return: None
+        """
+        self.get(name).record(duration_ns)
+
+    def summary(self):
+        """
+        :return: dictionary of histogram name to histogram summary
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return {histogram.name: histogram.summary() for histogram in histograms}
+
+    def report(self):
+        """
+        Prints a table of all histograms, durations in microseconds
+        :return: None
+        """
+        print(f'{"name":<40} {"count":>10} {"mean":>10} {"p50":>10} {"p99":>10} {"max":>10}')
+        for name, s in sorted(self.summary().items()):
+            print(f'{name:<40} {s["count"]:>10} {s["mean"] / 1e3:>10.1f} {s["p50"] / 1e3:>10.1f} '
+                  f'{s["p99"] / 1e3:>10.1f} {s["max"] / 1e3:>10.1f}')
+
+    def reset(self):
+        """
+        Removes all histograms
+        :return: None
+        """
+        with self._lock:
+            self._histograms = {}
+
+
+default_registry = ProfileRegistry()
+
+
+def profiled(name=None, sample_every: int = 1, registry: ProfileRegistry = None):
+    """
+    This decorator measures the duration of each call of the decorated function and records it in a profile registry.
+    Unlike timed, the return value of the function is unchanged. Can be used with or without arguments.
+    :param name: name of the histogram, defaults to the function's qualified name
+    :param sample_every: only measure every n-th call
+    :param registry: the registry to record in, defaults to default_registry
+    :return: decorated function
+    """
+    if callable(name):
+        return profiled()(name)
+
+    def decorator(func):
+        histogram_name = name or f'{func.__module__}.{func.__qualname__}'
+        target = registry or default_registry
+        calls = itertools.count()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled or (sample_every > 1 and next(calls) % sample_every):
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                target.record(histogram_name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+class profile_block:
+    """
+    Context manager measuring the duration of a block of code and recording it in a profile registry
+    """
+
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, name: str, registry: ProfileRegistry = None):
+        """
+        :param name: name of the histogram
+        :param registry: the registry to record in, defaults to default_registry
+        """
+        self._histogram = (registry or default_registry).get(name)
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns() if _enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._start is not None:
+            self._histogram.record(time.perf_counter_ns() - self._start)
+        return False
@@ -1,3 +1,13 @@
-from proccom.client import msgs
-from proccom.client.client_util import Publisher, Subscriber
-from proccom.master.master_node import Server
+from proccom._lazy import lazy_module
+
+# Client and server modules are imported on first access, so a node only loads the side it uses
+_ATTRIBUTES = {
+    'Publisher': 'client.client_util',
+    'Subscriber': 'client.client_util',
+    'Server': 'master.master_node',
+}
+_MODULES = {
+    'msgs': 'client.msgs',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, attributes=_ATTRIBUTES, modules=_MODULES)
@@ -76,7 +76,7 @@ class Subscriber:
     and implement handlers for each topic. The subscriber creates its own thread for handling messages.
     """
 
-    def __init__(self, topic_handler: dict, identity: str, host='127.0.0.1', port=5000):
+    def __init__(self, topic_handler: dict, identity: str, host='127.0.0.1', port=5000, threaded_handlers=True):
         """
         Constructor for the Subscriber class
 
@@ -84,8 +84,11 @@ class Subscriber:
         :param identity: The subscriber's identity
         :param host: The IP-address of the master node which will be connected to
         :param port: The port of the master node which will be connected to
+        :param threaded_handlers: Start a new thread for each handler call. If False, handlers are called directly from
+            the subscriber thread, which avoids the thread start latency but requires handlers to return quickly
         """
         self.handler = topic_handler
+        self.threaded_handlers = threaded_handlers
         self.id = identity
         self.soc = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.host = host
@@ -130,8 +133,11 @@ class Subscriber:
                     try:
                         jdata = json.loads(item.decode('utf-8'))
                         func = self.handler[jdata['topic']]
-                        handler_thread = Thread(target=func, args=[jdata])
-                        handler_thread.start()
+                        if self.threaded_handlers:
+                            handler_thread = Thread(target=func, args=[jdata])
+                            handler_thread.start()
+                        else:
+                            func(jdata)
                     except json.JSONDecodeError as e:
                         print('\n\n', e)
                         print('Caused by:', item)
@@ -1,2 +1,11 @@
-import regutil.controllers as controllers
-import regutil.util as util
+from regutil._lazy import lazy_module
+
+# Subpackages are imported on first access, so tools using only the timing utilities do not load NumPy
+_MODULES = {
+    'controllers': 'controllers',
+    'runtime': 'runtime',
+    'simulation': 'simulation',
+    'util': 'util',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, modules=_MODULES)
@@ -1 +1,9 @@
-from regutil.controllers.pid import *
+from regutil._lazy import lazy_module
+
+# PIDBank needs NumPy and is only imported when used
+_ATTRIBUTES = {
+    'PID': 'pid',
+    'PIDBank': 'pid_bank',
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, attributes=_ATTRIBUTES)
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class PIDBank:
+    """
+    This class implements the PID algorithm for many independent loops at once. Gains, targets and the controller
+    state are stored as arrays with one element per loop, and all loops are updated by a single vectorized calculate
+    call. The algorithm is the same as for PID.
+    """
+
+    def __init__(self, kp, ki, kd, n: int = None):
+        """
+        Creates a bank of PID controllers
+
+        :param kp: proportional gain, a scalar shared by all loops or one value per loop
+        :param ki: integral gain, a scalar shared by all loops or one value per loop
+        :param kd: derivative gain, a scalar shared by all loops or one value per loop
+        :param n: number of loops, inferred from the gains if None
+        """
+        if n is None:
+            n = max(np.size(kp), np.size(ki), np.size(kd))
+        self.n = n
+        self.kp = np.empty(n)
+        self.ki = np.empty(n)
+        self.kd = np.empty(n)
+        self.target = np.zeros(n)
+        self.e0 = np.zeros(n)
+        self.esum = np.zeros(n)
+        self.set_gains(kp=kp, ki=ki, kd=kd)
+
+    def set_gains(self, index=slice(None), kp=None, ki=None, kd=None):
+        """
+        Changes the gains of some or all loops in place
+
+        :param index: the loops to change (an int, slice, index array or boolean mask), all loops by default
+        :param kp: new proportional gain(s), unchanged if None
+        :param ki: new integral gain(s), unchanged if None
+        :param kd: new derivative gain(s), unchanged if None
+        :return: None
+        """
+        if kp is not None:
+            self.kp[index] = kp
+        if ki is not None:
+            self.ki[index] = ki
+        if kd is not None:
+            self.kd[index] = kd
+
+    def set_target(self, target, index=slice(None)):
+        """
+        Changes the target of some or all loops in place
+
+        :param target: the new target(s)
+        :param index: the loops to change (an int, slice, index array or boolean mask), all loops by default
+        :return: None
+        """
+        self.target[index] = target
+
+    def calculate(self, measurements, dt):
+        """
+        Updates all loops
+
+        :param measurements: one measurement per loop
+        :param dt: time step, a scalar or one value per loop
+        :return: arrays of c, p, i, d
+        """
+        e = self.target - measurements
+        de = (e - self.e0) / dt
+        self.esum += e * dt
+
+        self.e0[:] = e
+
+        p = self.kp * e
+        i = self.ki * self.esum
+        d = self.kd * de
+
+        c = p + i + d
+        return c, p, i, d
+
+    def reset(self, index=slice(None)):
+        """
+        Clears the stored error and integral of some or all loops
+
+        :param index: the loops to reset, all loops by default
+        :return: None
+        """
+        self.e0[index] = 0
+        self.esum[index] = 0
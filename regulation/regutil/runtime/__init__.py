@@ -0,0 +1 @@
+from regutil.runtime.control_loop import *
@@ -0,0 +1,197 @@
+import itertools
+import time
+from regutil.util.timing import ScheduledTask, SKIP
+
+
+class LatestValue:
+    """
+    Single slot mailbox handing the newest sample from a producer thread (e.g. a network handler) to the control
+    loop. put replaces the slot with a new tuple in one reference assignment, which is atomic in CPython, so neither
+    side takes a lock and the reader never sees a partially written sample. Older samples are simply overwritten.
+    """
+
+    __slots__ = ('_slot', '_counter')
+
+    def __init__(self):
+        self._slot = (0, 0, None)
+        self._counter = itertools.count(1)
+
+    def put(self, value):
+        """
+        Stores a new value
+
+        :param value: the value
+        :return: None
+        """
+        self._slot = (next(self._counter), time.perf_counter_ns(), value)
+
+    def get(self):
+        """
+        Returns the newest value
+
+        :return: sequence number (0 if nothing has been put), perf_counter_ns time of the put, the value
+        """
+        return self._slot
+
+
+class LatencyStats:
+    """
+    Running statistics of a duration, in seconds
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the statistics
+
+        :return: None
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, duration_ns: int):
+        """
+        Adds a duration
+
+        :param duration_ns: the duration in nanoseconds
+        :return: None
+        """
+        duration = duration_ns / 1e9
+        self.count += 1
+        self.mean += (duration - self.mean) / self.count
+        self.max = max(self.max, duration)
+        self.last = duration
+
+    def summary(self):
+        """
+        Returns the statistics as a dictionary
+
+        :return: the statistics
+        """
+        return {'count': self.count, 'mean': self.mean, 'max': self.max, 'last': self.last}
+
+
+class ControlLoop:
+    """
+    Runs measurement filtering, control and actuation in one scheduled tick on one thread.
+
+    Measurements arrive through handler, which can be used directly as a proccom Subscriber topic handler. The
+    handler only stores the newest sample in a LatestValue. Each tick takes that sample, passes it through the
+    filter (e.g. a dsp Filter), the controller (e.g. PID or PIDBank) and publishes the command (e.g. with a proccom
+    Publisher), without locks or queues between the stages. The duration of each stage and the latency from receiving
+    a measurement to publishing the resulting command are recorded in stats.
+    """
+
+    STAGES = ('filter', 'control', 'publish', 'tick', 'latency')
+
+    def __init__(self, interval, controller, publisher=None, flt=None, extract=None, require_new=False,
+                 spin_window=0.0002, overrun_policy=SKIP):
+        """
+        Creates a control loop
+
+        :param interval: the control period in seconds
+        :param controller: object with calculate(measurement, dt) returning the command as first element
+        :param publisher: object with publish(command), or None
+        :param flt: object with filter_value (or filter_values for multiple channels), or None for no filtering
+        :param extract: function taking a received message and returning the measurement (default msg['data'])
+        :param require_new: skip ticks where no new measurement has arrived, otherwise the last one is reused
+        :param spin_window: see ScheduledTask
+        :param overrun_policy: see ScheduledTask
+        """
+        self.interval = interval
+        self.controller = controller
+        self.publisher = publisher
+        self.filter = flt
+        self.extract = extract or (lambda msg: msg['data'])
+        self.require_new = require_new
+        self.latest = LatestValue()
+        self.stats = {stage: LatencyStats() for stage in self.STAGES}
+        self.command = None
+        self.task = ScheduledTask(interval, self.tick, spin_window=spin_window, overrun_policy=overrun_policy)
+        self.job = None
+        self._filter_func = None
+        if flt is not None:
+            self._filter_func = getattr(flt, 'filter_value', None) or flt.filter_values
+        self._last_seq = 0
+        self._last_tick = None
+
+    def handler(self, msg):
+        """
+        Stores a received measurement message. Safe to call from any thread.
+
+        :param msg: the received message
+        :return: None
+        """
+        self.latest.put(self.extract(msg))
+
+    def tick(self):
+        """
+        Runs one iteration of the loop: filter the newest measurement, run the controller and publish the command
+
+        :return: the command, None if the tick was skipped
+        """
+        t0 = time.perf_counter_ns()
+        seq, received, measurement = self.latest.get()
+        if seq == 0 or (self.require_new and seq == self._last_seq):
+            return None
+        self._last_seq = seq
+        dt = self.interval if self._last_tick is None else (t0 - self._last_tick) / 1e9
+        self._last_tick = t0
+
+        if self._filter_func is not None:
+            measurement = self._filter_func(measurement)
+        t1 = time.perf_counter_ns()
+        command = self.controller.calculate(measurement, dt)[0]
+        t2 = time.perf_counter_ns()
+        if self.publisher is not None:
+            self.publisher.publish(command)
+        t3 = time.perf_counter_ns()
+
+        self.command = command
+        self.stats['filter'].add(t1 - t0)
+        self.stats['control'].add(t2 - t1)
+        self.stats['publish'].add(t3 - t2)
+        self.stats['tick'].add(t3 - t0)
+        self.stats['latency'].add(t3 - received)
+        return command
+
+    def start(self, delay=0.0, scheduler=None, priority=0):
+        """
+        Starts running the loop, on its own ScheduledTask thread or as a job of a shared Scheduler
+
+        :param delay: seconds until the first tick
+        :param scheduler: a regutil Scheduler to run the loop on, None to use a ScheduledTask
+        :param priority: the job priority when run on a scheduler
+        :return: None
+        """
+        self._last_tick = None
+        if scheduler is None:
+            self.task.start(delay=delay)
+        else:
+            self.job = scheduler.schedule(
+                self.interval, self.tick, priority=priority, delay=delay, overrun_policy=self.task.overrun_policy
+            )
+
+    def stop(self):
+        """
+        Stops the loop
+
+        :return: None
+        """
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        else:
+            self.task.stop()
+
+    def summary(self):
+        """
+        Returns the stage statistics as a dictionary
+
+        :return: the statistics for each stage
+        """
+        return {stage: stats.summary() for stage, stats in self.stats.items()}
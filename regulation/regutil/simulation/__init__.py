@@ -0,0 +1 @@
+from regutil.simulation.closed_loop import *
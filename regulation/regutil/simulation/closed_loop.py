@@ -0,0 +1,155 @@
+import numpy as np
+from regutil.controllers.pid_bank import PIDBank
+
+
+class PlantBank:
+    """
+    Many copies of one discrete plant, stepped together. The plant is a transfer function in the same convention as
+    the dsp package's Filter: y[n] = a[0] * (sum(b[i] * u[n - i]) - sum(a[j] * y[n - j] for j >= 1)).
+    """
+
+    def __init__(self, b: list, a: list = None, n: int = 1):
+        """
+        Creates a bank of plants
+
+        :param b: numerator coefficients of the transfer function (coeffs of U)
+        :param a: denominator coefficients of the transfer function (coeffs of Y)
+        :param n: number of copies
+        """
+        if not a:
+            a = [1]
+        self.b = np.asarray(b, dtype=float)
+        self.a0 = a[0]
+        self.a = np.asarray(a[1:], dtype=float)
+        self.n = n
+        self.u = np.zeros((n, len(self.b)))
+        self.y = np.zeros((n, len(self.a)))
+
+    def step(self, u):
+        """
+        Advances all plants one sample
+
+        :param u: the input of each plant
+        :return: the output of each plant
+        """
+        self.u[:, 1:] = self.u[:, :-1]
+        self.u[:, 0] = u
+        y = self.a0 * (self.u @ self.b - self.y @ self.a)
+        if len(self.a):
+            self.y[:, 1:] = self.y[:, :-1]
+            self.y[:, 0] = y
+        return y
+
+
+def simulate_step(b: list, a: list, kp, ki, kd, dt: float, steps: int, setpoint: float = 1.0):
+    """
+    Simulates the closed loop step response of a plant for many PID gain sets at once. At each sample the controllers
+    act on the plant output of the previous sample, which avoids an algebraic loop for plants with direct feedthrough.
+
+    :param b: plant numerator coefficients (dsp Filter convention)
+    :param a: plant denominator coefficients (dsp Filter convention)
+    :param kp: proportional gains, one per candidate
+    :param ki: integral gains, one per candidate
+    :param kd: derivative gains, one per candidate
+    :param dt: the sample time
+    :param steps: number of samples
+    :param setpoint: the step height
+    :return: plant outputs and controller outputs (candidates x steps)
+    """
+    controllers = PIDBank(kp, ki, kd)
+    controllers.set_target(setpoint)
+    plants = PlantBank(b, a, n=controllers.n)
+    y = np.zeros((controllers.n, steps))
+    u = np.zeros((controllers.n, steps))
+    measurement = np.zeros(controllers.n)
+    with np.errstate(over='ignore', invalid='ignore'):
+        for k in range(steps):
+            u[:, k] = controllers.calculate(measurement, dt)[0]
+            measurement = plants.step(u[:, k])
+            y[:, k] = measurement
+    return y, u
+
+
+def step_metrics(y, dt: float, setpoint: float = 1.0, settling_band: float = 0.02):
+    """
+    Calculates step response metrics for many responses at once. Unstable or diverging responses get infinite values.
+
+    :param y: step responses (candidates x steps)
+    :param dt: the sample time
+    :param setpoint: the step height
+    :param settling_band: relative band around the setpoint for the settling time
+    :return: dictionary of metric arrays: iae, ise, overshoot (relative), rise_time (10 - 90 %),
+        settling_time and steady_state_error
+    """
+    y = np.atleast_2d(y)
+    steps = y.shape[1]
+    valid = np.isfinite(y).all(axis=1)
+    y = np.where(np.isfinite(y), y, 0.0)
+    e = setpoint - y
+    t = np.arange(1, steps + 1) * dt
+
+    def first_index(mask):
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), steps)
+
+    t_full = np.append(t, np.inf)
+    rise = t_full[first_index(y >= 0.9 * setpoint)] - t_full[first_index(y >= 0.1 * setpoint)]
+    outside = np.abs(e) > settling_band * abs(setpoint)
+    last_outside = np.where(outside.any(axis=1), steps - 1 - outside[:, ::-1].argmax(axis=1), -1)
+    settling = np.where(last_outside < steps - 1, t_full[last_outside + 1], np.inf)
+    metrics = {
+        'iae': np.abs(e).sum(axis=1) * dt,
+        'ise': (e ** 2).sum(axis=1) * dt,
+        'overshoot': np.maximum(y.max(axis=1) - setpoint, 0) / abs(setpoint),
+        'rise_time': rise,
+        'settling_time': settling,
+        'steady_state_error': np.abs(e[:, -1]),
+    }
+    for values in metrics.values():
+        values[~valid] = np.inf
+    return metrics
+
+
+def autotune(b: list, a: list, dt: float, steps: int, kp_range, ki_range, kd_range=(0, 0), candidates: int = 4096,
+             cost='iae', setpoint: float = 1.0, processes: int = None, batch_size: int = 1024, seed: int = None):
+    """
+    Searches for PID gains by simulating randomly sampled gain sets in parallel.
+    Candidates are simulated in vectorized batches, which are optionally spread across a process pool.
+
+    :param b: plant numerator coefficients (dsp Filter convention)
+    :param a: plant denominator coefficients (dsp Filter convention)
+    :param dt: the sample time
+    :param steps: number of samples per simulation
+    :param kp_range: (min, max) of the proportional gain
+    :param ki_range: (min, max) of the integral gain
+    :param kd_range: (min, max) of the derivative gain
+    :param candidates: number of gain sets to try
+    :param cost: name of a step_metrics metric, or a function taking the metrics dictionary and returning costs
+    :param setpoint: the step height
+    :param processes: number of worker processes, None or 0 to run in this process
+    :param batch_size: number of candidates simulated together
+    :param seed: seed for sampling the gains
+    :return: best (kp, ki, kd), its metrics, and all gains (candidates x 3) with their costs
+    """
+    rng = np.random.default_rng(seed)
+    gains = np.column_stack([rng.uniform(low, high, candidates) for low, high in (kp_range, ki_range, kd_range)])
+    batches = [
+        (b, a, gains[i:i + batch_size], dt, steps, setpoint) for i in range(0, candidates, batch_size)
+    ]
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor  # imports multiprocessing, only needed for a pool
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_evaluate_batch, batches))
+    else:
+        results = [_evaluate_batch(batch) for batch in batches]
+    metrics = {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+    costs = metrics[cost] if isinstance(cost, str) else np.asarray(cost(metrics), dtype=float)
+    costs = np.where(np.isfinite(costs), costs, np.inf)
+    best = int(np.argmin(costs))
+    best_metrics = {key: float(values[best]) for key, values in metrics.items()}
+    return tuple(gains[best].tolist()), best_metrics, gains, costs
+
+
+def _evaluate_batch(batch):
+    b, a, gains, dt, steps, setpoint = batch
+    y, _ = simulate_step(b, a, gains[:, 0], gains[:, 1], gains[:, 2], dt, steps, setpoint)
+    return step_metrics(y, dt, setpoint)
@@ -1 +1,2 @@
 from regutil.util.timing import *
+from regutil.util.scheduler import *
@@ -0,0 +1,233 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+import traceback
+from regutil.util.timing import TimingStats, next_tick, SKIP, CATCH_UP, SHIFT
+
+
+class Job:
+    """
+    A task registered with a Scheduler. Holds the task's schedule and timing statistics.
+    """
+
+    def __init__(self, task, args, kwargs, interval, priority, overrun_policy, deadline):
+        """
+        Creates a job. Jobs are created by Scheduler.schedule and Scheduler.schedule_once.
+
+        :param task: the function to call
+        :param args: arguments for the task
+        :param kwargs: keyword arguments for the task
+        :param interval: the period in seconds, None for a one-shot job
+        :param priority: jobs with higher priority run first when several are due
+        :param overrun_policy: SKIP, CATCH_UP or SHIFT (see ScheduledTask)
+        :param deadline: seconds after the scheduled time by which the task must have returned, None for no deadline
+        """
+        if overrun_policy not in (SKIP, CATCH_UP, SHIFT):
+            raise ValueError(f'unknown overrun policy {overrun_policy}')
+        self.task = task
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.priority = priority
+        self.overrun_policy = overrun_policy
+        self.deadline = deadline
+        self.stats = TimingStats()
+        self.cancelled = False
+        self.running = False
+        self.origin = 0
+        self.tick = 0
+
+    def cancel(self):
+        """
+        Removes the job from its scheduler. A call that is already running is completed.
+
+        :return: None
+        """
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Runs many periodic and one-shot tasks from a single timing thread.
+
+    Due times are kept in a heap on the perf_counter_ns clock. The timing thread sleeps until spin_window seconds
+    before the earliest due time, busy waits for the remainder, and then dispatches every due job, highest priority
+    first. With workers == 0 the tasks are called inline on the timing thread, otherwise they are put on a bounded
+    priority queue served by a pool of worker threads. A job is never run concurrently with itself: a tick that comes
+    due while the previous call is still queued or running is counted as an overrun and skipped.
+    """
+
+    def __init__(self, spin_window=0.0002, workers: int = 0, queue_size: int = 64):
+        """
+        Creates a scheduler
+
+        :param spin_window: seconds before each due time spent busy waiting instead of sleeping (0 never spins)
+        :param workers: number of worker threads, 0 runs tasks on the timing thread
+        :param queue_size: maximum number of calls waiting for a worker, further calls are skipped
+        """
+        self.spin_window = spin_window
+        self.workers = workers
+        self.shutdown = False
+        self.thread = None
+        self.worker_threads = []
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._queue = queue.PriorityQueue(maxsize=queue_size)
+
+    def schedule(self, interval, task, *args, priority=0, delay=0.0, overrun_policy=SKIP, deadline=None, **kwargs):
+        """
+        Adds a periodic task
+
+        :param interval: the period in seconds
+        :param task: the function to call
+        :param args: arguments for the task
+        :param priority: jobs with higher priority run first when several are due
+        :param delay: seconds until the first call
+        :param overrun_policy: SKIP, CATCH_UP or SHIFT (see ScheduledTask)
+        :param deadline: seconds after the scheduled time by which the task must have returned (default interval)
+        :param kwargs: keyword arguments for the task
+        :return: the Job
+        """
+        job = Job(task, args, kwargs, interval, priority, overrun_policy, interval if deadline is None else deadline)
+        job.origin = time.perf_counter_ns() + int(delay * 1e9)
+        self._push(job, job.origin)
+        return job
+
+    def schedule_once(self, delay, task, *args, priority=0, deadline=None, **kwargs):
+        """
+        Adds a task to be called once
+
+        :param delay: seconds until the call
+        :param task: the function to call
+        :param args: arguments for the task
+        :param priority: jobs with higher priority run first when several are due
+        :param deadline: seconds after the scheduled time by which the task must have returned, None for no deadline
+        :param kwargs: keyword arguments for the task
+        :return: the Job
+        """
+        job = Job(task, args, kwargs, None, priority, SKIP, deadline)
+        self._push(job, time.perf_counter_ns() + int(delay * 1e9))
+        return job
+
+    def start(self):
+        """
+        Starts the timing thread and the worker threads
+
+        :return: None
+        """
+        self.shutdown = False
+        while not self._queue.empty():  # calls left over from a previous run
+            self._queue.get_nowait()[2].running = False
+        self.worker_threads = [
+            threading.Thread(target=self._work, name=f'scheduler_worker_{i}') for i in range(self.workers)
+        ]
+        for thread in self.worker_threads:
+            thread.start()
+        self.thread = threading.Thread(target=self._run, name='scheduler')
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the scheduler. Calls that are already running are completed.
+
+        :return: None
+        """
+        self.shutdown = True
+        with self._cond:
+            self._cond.notify()
+
+    def _push(self, job: Job, due: int):
+        with self._cond:
+            heapq.heappush(self._heap, (due, -job.priority, next(self._sequence), job))
+            self._cond.notify()
+
+    def _run(self):
+        spin_ns = int(self.spin_window * 1e9)
+        while not self.shutdown:
+            with self._cond:
+                if not self._heap:
+                    self._cond.wait(0.1)
+                    continue
+                due = self._heap[0][0]
+                remaining = due - time.perf_counter_ns()
+                if remaining > spin_ns:
+                    self._cond.wait(min(remaining - spin_ns, 1e8) / 1e9)
+                    continue
+            while time.perf_counter_ns() < due:
+                pass
+            with self._cond:
+                now = time.perf_counter_ns()
+                ready = []
+                while self._heap and self._heap[0][0] <= now:
+                    ready.append(heapq.heappop(self._heap))
+            ready.sort(key=lambda entry: (entry[1], entry[0], entry[2]))
+            for due, _, _, job in ready:
+                if job.cancelled:
+                    continue
+                if self.shutdown:
+                    # Keep the job for a later start()
+                    self._push(job, due)
+                else:
+                    self._dispatch(job, due)
+
+    def _dispatch(self, job: Job, due: int):
+        """
+        Runs or queues a due job and schedules its next call
+
+        :param job: the job
+        :param due: the scheduled time of this call
+        :return: None
+        """
+        if job.running:
+            job.stats.overruns += 1
+            job.stats.skipped += 1
+        elif self.workers:
+            job.running = True
+            try:
+                self._queue.put_nowait((-job.priority, next(self._sequence), job, due))
+            except queue.Full:
+                job.running = False
+                job.stats.overruns += 1
+                job.stats.skipped += 1
+        else:
+            job.running = True
+            self._execute(job, due)
+        if job.interval is not None and not job.cancelled:
+            interval_ns = int(job.interval * 1e9)
+            job.origin, job.tick = next_tick(
+                job.origin, job.tick + 1, interval_ns, time.perf_counter_ns(), job.overrun_policy, job.stats
+            )
+            self._push(job, job.origin + job.tick * interval_ns)
+
+    def _execute(self, job: Job, due: int):
+        """
+        Calls a job's task and records its timing
+
+        :param job: the job
+        :param due: the scheduled time of this call
+        :return: None
+        """
+        start = time.perf_counter_ns()
+        job.stats.add((start - due) / 1e9)
+        try:
+            job.task(*job.args, **job.kwargs)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            if job.deadline is not None and time.perf_counter_ns() - due > job.deadline * 1e9:
+                job.stats.deadline_misses += 1
+            job.running = False
+
+    def _work(self):
+        while not self.shutdown:
+            try:
+                _, _, job, due = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if job.cancelled:
+                job.running = False
+            else:
+                self._execute(job, due)
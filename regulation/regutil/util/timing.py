@@ -2,38 +2,201 @@ import threading
 import time
 
 
+SKIP = 'skip'
+CATCH_UP = 'catch_up'
+SHIFT = 'shift'
+
+
+class TimingStats:
+    """
+    Running statistics of a periodic task's timing. Jitter is the delay from a tick's deadline to the start of the
+    task call, in seconds.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the statistics
+
+        :return: None
+        """
+        self.count = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.deadline_misses = 0
+        self.jitter_mean = 0.0
+        self.jitter_max = 0.0
+        self.jitter_min = 0.0
+        self.jitter_last = 0.0
+        self._m2 = 0.0
+
+    def add(self, jitter: float):
+        """
+        Adds the jitter of a task call (Welford's online algorithm for mean and variance)
+
+        :param jitter: the jitter in seconds
+        :return: None
+        """
+        self.count += 1
+        delta = jitter - self.jitter_mean
+        self.jitter_mean += delta / self.count
+        self._m2 += delta * (jitter - self.jitter_mean)
+        self.jitter_max = jitter if self.count == 1 else max(self.jitter_max, jitter)
+        self.jitter_min = jitter if self.count == 1 else min(self.jitter_min, jitter)
+        self.jitter_last = jitter
+
+    @property
+    def jitter_std(self):
+        """
+        Standard deviation of the jitter in seconds
+        """
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def summary(self):
+        """
+        Returns the statistics as a dictionary
+
+        :return: the statistics
+        """
+        return {
+            'count': self.count, 'overruns': self.overruns, 'skipped': self.skipped,
+            'deadline_misses': self.deadline_misses,
+            'jitter_mean': self.jitter_mean, 'jitter_std': self.jitter_std,
+            'jitter_min': self.jitter_min, 'jitter_max': self.jitter_max,
+        }
+
+
+def next_tick(origin: int, tick: int, interval_ns: int, now: int, overrun_policy: str, stats: TimingStats):
+    """
+    Applies an overrun policy to the tick following a task call. The tick is an overrun if its deadline
+    (origin + tick * interval_ns) has already passed.
+
+    :param origin: the schedule's origin in perf_counter_ns time
+    :param tick: the next tick
+    :param interval_ns: the period in nanoseconds
+    :param now: the current perf_counter_ns time
+    :param overrun_policy: SKIP, CATCH_UP or SHIFT
+    :param stats: statistics to record overruns and skipped ticks in
+    :return: the new origin and tick
+    """
+    late = now - (origin + tick * interval_ns)
+    if late > 0:
+        stats.overruns += 1
+        if overrun_policy == SKIP:
+            missed = late // interval_ns + 1
+            stats.skipped += missed
+            tick += missed
+        elif overrun_policy == SHIFT:
+            origin, tick = now + interval_ns, 0
+    return origin, tick
+
+
 class ScheduledTask:
+    """
+    Calls a task periodically from its own thread.
+
+    Deadlines are computed from the start time and the tick count on the monotonic perf_counter_ns clock, so the
+    schedule does not drift and is unaffected by changes to the wall clock. The thread sleeps until spin_window
+    seconds before a deadline and busy waits only for the remainder. A tick is an overrun when its deadline has
+    already passed when the previous call returns. Overruns are handled according to
+    overrun_policy:
 
-    def __init__(self, interval, task, *args, adaptive_interval=False, **kwargs):
+    - SKIP: the missed ticks are dropped and the schedule continues at the next deadline in the future
+    - CATCH_UP: the missed ticks are run back to back until the schedule is caught up
+    - SHIFT: the schedule is restarted one interval after the late call (the phase shifts)
+    """
+
+    def __init__(self, interval, task, *args, adaptive_interval=False, spin_window=0.0002, overrun_policy=SKIP,
+                 **kwargs):
+        """
+        Creates a scheduled task
+
+        :param interval: the period in seconds
+        :param task: the function to call
+        :param args: arguments for the task
+        :param adaptive_interval: legacy behaviour, increase the interval by 1 % at each overrun
+        :param spin_window: seconds before each deadline spent busy waiting instead of sleeping (0 never spins)
+        :param overrun_policy: SKIP, CATCH_UP or SHIFT
+        :param kwargs: keyword arguments for the task
+        """
+        if overrun_policy not in (SKIP, CATCH_UP, SHIFT):
+            raise ValueError(f'unknown overrun policy {overrun_policy}')
         self.interval = interval
         self.task = task
         self.args = args
         self.kwargs = kwargs
         self.adaptive_interval = adaptive_interval
+        self.spin_window = spin_window
+        self.overrun_policy = overrun_policy
+        self.stats = TimingStats()
         self.shutdown = False
-        self.thread = threading.Thread(target=self._run)
+        self.thread = None
         self.t = 0
 
     def _run(self):
+        origin = self.t
+        tick = 0
+        interval_ns = int(self.interval * 1e9)
         while not self.shutdown:
-            try:
-                time.sleep((self.t - time.time()) * 0.8)
-                while self.t >= time.time():
-                    pass
-            except ValueError as e:
-                # print('value_error')
-                if self.adaptive_interval:
-                    self.interval *= 1.01
-            finally:
-                self.t += self.interval
-                self.task(*self.args, **self.kwargs)
+            deadline = origin + tick * interval_ns
+            self._wait(deadline)
+            if self.shutdown:
+                break
+            now = time.perf_counter_ns()
+            self.stats.add((now - deadline) / 1e9)
+            self.task(*self.args, **self.kwargs)
+            tick += 1
+
+            now = time.perf_counter_ns()
+            if self.adaptive_interval and now - (origin + tick * interval_ns) > 0:
+                self.stats.overruns += 1
+                self.interval *= 1.01
+                origin, tick, interval_ns = now, 0, int(self.interval * 1e9)
+            else:
+                origin, tick = next_tick(origin, tick, interval_ns, now, self.overrun_policy, self.stats)
+            self.t = origin + tick * interval_ns
+
+    def _wait(self, deadline: int):
+        """
+        Sleeps until spin_window before the deadline, then busy waits until the deadline. Returns early when the
+        task is stopped.
+
+        :param deadline: the deadline in perf_counter_ns time
+        :return: None
+        """
+        spin_ns = int(self.spin_window * 1e9)
+        remaining = deadline - time.perf_counter_ns()
+        while remaining > spin_ns and not self.shutdown:
+            time.sleep(min(remaining - spin_ns, 0.1e9) / 1e9)
+            remaining = deadline - time.perf_counter_ns()
+        if self.shutdown:
+            return
+        while time.perf_counter_ns() < deadline and not self.shutdown:
+            pass
 
     def start(self, delay=0.0):
+        """
+        Starts calling the task in a new thread
+
+        :param delay: seconds until the first call
+        :return: None
+        """
+        if self.thread is not None and self.thread.is_alive():
+            raise RuntimeError('scheduled task is already running')
         self.shutdown = False
-        self.t = time.time() + delay
+        self.stats.reset()
+        self.t = time.perf_counter_ns() + int(delay * 1e9)
+        self.thread = threading.Thread(target=self._run)
         self.thread.start()
 
     def stop(self):
+        """
+        Stops the task after the current call
+
+        :return: None
+        """
         self.shutdown = True
 
 
@@ -60,6 +223,7 @@ def main():
     time.sleep(10)
     for t in tasks:
         t.stop()
+        print(t.stats.summary())
     for i in lst:
         print(i)
     mean = sum([y for x, y, z in lst[1:]]) / len(lst)
@@ -71,4 +235,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-    # TODO workout precision of time.time() how many decimal places, what resolution. Micros better?
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+from regutil.util.timing import ScheduledTask
+
+
+def test_stop_returns_without_spinning_until_deadline():
+    calls = []
+    task = ScheduledTask(5, calls.append, 1)
+    task.start()
+    time.sleep(0.3)
+    cpu = time.process_time()
+    start = time.perf_counter()
+    task.stop()
+    task.thread.join(timeout=2)
+    assert not task.thread.is_alive()
+    assert time.perf_counter() - start < 0.5
+    assert time.process_time() - cpu < 0.2
+    assert calls == [1]
+
+
+def test_stop_during_spin_window():
+    task = ScheduledTask(5, lambda: None, spin_window=5)
+    task.start()
+    time.sleep(0.1)
+    start = time.perf_counter()
+    task.stop()
+    task.thread.join(timeout=2)
+    assert not task.thread.is_alive()
+    assert time.perf_counter() - start < 0.5
+
+
+def test_start_while_running_raises():
+    task = ScheduledTask(5, lambda: None)
+    task.start()
+    try:
+        with pytest.raises(RuntimeError):
+            task.start()
+    finally:
+        task.stop()
+        task.thread.join(timeout=2)
+    task.start()
+    task.stop()
+    task.thread.join(timeout=2)
+    assert not task.thread.is_alive()
@@ -0,0 +1,64 @@
+import os
+import setuptools
+
+# Top level packages of the distribution and the folders of the separately installable modules they live in
+PACKAGES = {
+    'decorators': 'general',
+    'dsp': 'dsp-module',
+    'proccom': 'process-communication',
+    'regutil': 'regulation',
+}
+
+
+def read_requirements():
+    """
+    Combines the requirements of all modules
+    :return: list of requirements without duplicates
+    """
+    requirements = []
+    for folder in PACKAGES.values():
+        with open(os.path.join(folder, 'requirements.txt'), 'r') as req:
+            for line in req.read().split('\n'):
+                line = line.strip()
+                if line and line not in requirements:
+                    requirements.append(line)
+    return requirements
+
+
+def find_packages():
+    """
+    Finds the packages and subpackages of all modules
+    :return: list of package names and the package directory mapping
+    """
+    packages = []
+    package_dir = {}
+    for package, folder in PACKAGES.items():
+        package_dir[package] = os.path.join(folder, package)
+        packages += setuptools.find_packages(where=folder, include=(package, package + '.*'))
+    return packages, package_dir
+
+
+with open("README.md", 'r') as fh:
+    long_description = fh.read()
+
+packages, package_dir = find_packages()
+
+setuptools.setup(
+    name="rntools",
+    version="1.0.0",
+    author="Ruben Natvik",
+    author_email="ronatvik@gmail.com",
+    description="A collection of commonly used modules and tools.",
+    long_description=long_description,
+    long_description_content_type="text/markdown",
+    install_requires=read_requirements(),
+    url="https://github.com/RNatvik/rntools",
+    packages=packages,
+    package_dir=package_dir,
+    classifiers=[
+        "Programming Language :: Python :: 3",
+        "License :: OSI Approved :: MIT License",
+        "Operating System :: OS Independent",
+    ],
+    python_requires='>=3.8',
+)